@@ -2,11 +2,22 @@ import os
 import logging
 from pathlib import Path
 import aiosqlite
+import sqlite3
 from typing import Optional
 import json
 
 logger = logging.getLogger(__name__)
 
+def _adapt_json(value) -> str:
+    """Store dict/list query parameters as compact JSON text"""
+    return json.dumps(value, separators=(",", ":"))
+
+sqlite3.register_adapter(dict, _adapt_json)
+sqlite3.register_adapter(list, _adapt_json)
+
+# user_version from which so_asset_events.created_at holds epoch milliseconds
+EVENT_MS_SCHEMA_VERSION = 1
+
 # Global database connection
 _db: Optional[aiosqlite.Connection] = None
 
@@ -28,11 +39,15 @@ async def init_db() -> None:
         _db = await aiosqlite.connect(
             str(db_path),
             timeout=30.0,
+            cached_statements=256,
         )
         
         # Enable foreign keys and JSON1
         await _db.execute("PRAGMA foreign_keys = ON")
         await _db.execute("PRAGMA journal_mode = WAL")
+        # WAL stays consistent with NORMAL sync; fsync happens at checkpoints
+        await _db.execute("PRAGMA synchronous = NORMAL")
+        await _db.execute("PRAGMA cache_size = -20000")
         
         # Create tables
         await create_tables()
@@ -157,12 +172,24 @@ async def create_tables() -> None:
             event_type TEXT NOT NULL,
             payload_json TEXT NOT NULL,
             job_id TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            created_at INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER) * 1000),
             FOREIGN KEY (asset_id) REFERENCES so_assets(id),
             FOREIGN KEY (job_id) REFERENCES so_jobs(id)
         )
     """)
     
+    # Event timestamps are epoch milliseconds; convert ISO strings left by
+    # older releases once, recorded in the database's user_version
+    cursor = await _db.execute("PRAGMA user_version")
+    schema_version = (await cursor.fetchone())[0]
+    if schema_version < EVENT_MS_SCHEMA_VERSION:
+        await _db.execute("""
+            UPDATE so_asset_events
+            SET created_at = CAST(ROUND((julianday(created_at) - 2440587.5) * 86400000) AS INTEGER)
+            WHERE typeof(created_at) = 'text'
+        """)
+        await _db.execute(f"PRAGMA user_version = {EVENT_MS_SCHEMA_VERSION}")
+    
     # Create indices for asset events
     await _db.execute("CREATE INDEX IF NOT EXISTS idx_asset_events_asset_time ON so_asset_events(asset_id, created_at)")
     await _db.execute("CREATE INDEX IF NOT EXISTS idx_asset_events_type ON so_asset_events(event_type)")
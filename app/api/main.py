@@ -9,6 +9,8 @@ from pathlib import Path
 
 from app.api.routers import health, config, assets, jobs, rules, overlays, reports, drives, system, wizard, websocket, settings, guardrails, filesystem, obs, events, notifications, logs
 from app.api.db.database import init_db, close_db, get_db
+from app.api.services.asset_events import AssetEventService
+from app.api.responses import ORJSONResponse
 from app.api.services.nats_service import NATSService
 from app.api.services.config_service import ConfigService
 from app.api.services.gpu_service import gpu_service
@@ -39,6 +41,7 @@ async def lifespan(app: FastAPI):
     # Initialize database
     logger.info("Initializing database...")
     await init_db()
+    await AssetEventService.start()
     logger.info("Database initialized")
     
     # Initialize GPU service
@@ -115,7 +118,8 @@ async def lifespan(app: FastAPI):
     if hasattr(app.state, 'nats'):
         await app.state.nats.disconnect()
     
-    # Close database
+    # Flush pending asset events and close database
+    await AssetEventService.stop()
     await close_db()
     
     logger.info("StreamOps API shutdown complete")
@@ -125,7 +129,8 @@ app = FastAPI(
     title="StreamOps API",
     description="Media pipeline automation for streamers",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Ensure "no slash" and "slash" both resolve cleanly
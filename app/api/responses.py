@@ -0,0 +1,48 @@
+"""Shared response classes for the API"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePath
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from ulid import ULID
+
+
+def _default(value: Any) -> Any:
+    """Serialize types orjson does not handle natively"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, (ULID, PurePath)):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson
+
+    Content that is already serialized (bytes) is sent as-is, so handlers can
+    return pydantic-core output without a second encoding pass.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> ORJSONResponse:
+    """Serialize a model straight to JSON bytes, skipping jsonable_encoder"""
+    return ORJSONResponse(model.__pydantic_serializer__.to_json(model), status_code=status_code)
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks, Response
 from fastapi.responses import StreamingResponse, FileResponse
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from pydantic import BaseModel, Field
 import uuid
@@ -9,6 +9,7 @@ import os
 import json
 import logging
 import aiosqlite
+import orjson
 
 from app.api.schemas.assets import (
     AssetResponse, AssetCreate, AssetUpdate, AssetListResponse,
@@ -20,6 +21,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Sorts history entries without a usable timestamp first
+_EPOCH_MIN = datetime.min.replace(tzinfo=timezone.utc)
+
 # Additional Pydantic models for new endpoints
 class AssetDetailResponse(BaseModel):
     asset: Dict[str, Any]
@@ -798,6 +802,8 @@ async def get_asset_history(
     db=Depends(get_db)
 ) -> dict:
     """Get the complete history of an asset including movements and operations"""
+    from app.api.services.asset_events import event_time_iso
+    
     try:
         # Get asset basic info
         cursor = await db.execute("""
@@ -872,8 +878,9 @@ async def get_asset_history(
         })
         
         async for event_row in cursor:
-            event_type, event_time, payload_json, job_id = event_row
+            event_type, event_ms, payload_json, job_id = event_row
             payload = json.loads(payload_json) if payload_json else {}
+            event_time = event_time_iso(event_ms)
             
             # Skip recorded events as we handle indexing at the top
             if event_type == 'recorded':
@@ -931,12 +938,25 @@ async def get_asset_history(
                     }
                 })
         
+        # Parse the different timestamp formats as aware UTC datetimes; job
+        # timestamps are naive UTC strings, event timestamps carry an offset
+        def parse_timestamp(ts):
+            if not ts:
+                return _EPOCH_MIN
+            try:
+                parsed = datetime.fromisoformat(str(ts).replace('Z', '+00:00'))
+            except ValueError:
+                return _EPOCH_MIN
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return parsed
+        
         # Add job events if we found any
         for job_event in job_events:
             # Check if we don't already have this event from asset_events
+            job_time = parse_timestamp(job_event["timestamp"])
             if not any(e["type"] == job_event["type"] and 
-                      abs(datetime.fromisoformat(e["timestamp"]).timestamp() - 
-                          datetime.fromisoformat(job_event["timestamp"]).timestamp()) < 60 
+                      abs((parse_timestamp(e["timestamp"]) - job_time).total_seconds()) < 60 
                       for e in events if e["timestamp"]):
                 events.append(job_event)
         
@@ -944,20 +964,6 @@ async def get_asset_history(
         indexed_event = events[0] if events else None
         other_events = events[1:] if len(events) > 1 else []
         
-        # Sort other events by timestamp, parsing different formats
-        def parse_timestamp(ts):
-            if not ts:
-                return datetime.min
-            try:
-                # Try parsing ISO format with microseconds
-                if 'T' in ts:
-                    return datetime.fromisoformat(ts.replace('Z', '+00:00'))
-                # Try parsing space-separated format
-                else:
-                    return datetime.fromisoformat(ts)
-            except:
-                return datetime.min
-        
         other_events = sorted(other_events, key=lambda x: parse_timestamp(x.get("timestamp")))
         
         # Reconstruct events list with indexed at top
@@ -980,6 +986,34 @@ async def get_asset_history(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{asset_id}/timeline")
+async def get_asset_timeline(asset_id: str) -> StreamingResponse:
+    """Stream the event timeline of an asset as a JSON array"""
+    from app.api.services.asset_events import AssetEventService
+    
+    events = AssetEventService.iter_asset_timeline(asset_id)
+    try:
+        # Read the first page before the response starts, so a failing query
+        # is still reported as a 500
+        first = await anext(events, None)
+    except Exception as e:
+        logger.error(f"Failed to get timeline for asset {asset_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    async def encode():
+        # Rows are encoded page by page so long histories never sit in memory.
+        # A later error propagates and aborts the response rather than closing
+        # the array, so clients never get a truncated but valid document.
+        yield b"["
+        if first is not None:
+            yield orjson.dumps(first)
+            async for event in events:
+                yield b"," + orjson.dumps(event)
+        yield b"]"
+    
+    return StreamingResponse(encode(), media_type="application/json")
+
+
 @router.get("/{asset_id}/proxies")
 async def get_asset_proxies(
     asset_id: str,
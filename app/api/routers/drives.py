@@ -17,6 +17,7 @@ from app.api.schemas.drives import (
     DriveStatus, WatcherStatus, DriveType
 )
 from app.api.db.database import get_db
+from app.api.routers.wizard import invalidate_roles_verified
 import aiofiles
 import psutil
 
@@ -685,6 +686,7 @@ async def remove_role_assignment(
     try:
         await db.execute("DELETE FROM so_roles WHERE role = ?", (role,))
         await db.commit()
+        invalidate_roles_verified()
         
         logger.info(f"Removed role assignment for {role}")
         
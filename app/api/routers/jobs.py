@@ -2,7 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends, Query, WebSocket, WebSock
 from fastapi.responses import JSONResponse
 from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime, timedelta
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 import uuid
 import json
 import os
@@ -11,6 +11,7 @@ import logging
 import aiosqlite
 
 from app.api.db.database import get_db
+from app.api.responses import ORJSONResponse, model_response
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +56,9 @@ class JobItem(BaseModel):
     next_run_at: Optional[str] = None
     attempts: int = 0
 
+# Serializes a whole page of job items in one pydantic-core call
+_JOB_ITEMS_ADAPTER = TypeAdapter(List[JobItem])
+
 class JobListResponse(BaseModel):
     items: List[JobItem]
     page: int
@@ -203,7 +207,7 @@ async def list_jobs(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(50, ge=1, le=100, description="Items per page"),
     db=Depends(get_db)
-) -> JobListResponse:
+) -> ORJSONResponse:
     """List all jobs with filtering, sorting, and pagination"""
     try:
         # Build query
@@ -291,7 +295,7 @@ async def list_jobs(
             # Check if job is deferred based on state
             is_deferred = row_dict.get('state') == 'deferred'
             
-            items.append(JobItem(
+            fields = dict(
                 id=row_dict.get('id', ''),
                 type=row_dict.get('type', ''),
                 asset_id=row_dict.get('asset_id'),
@@ -308,14 +312,25 @@ async def list_jobs(
                 blocked_reason=row_dict.get('blocked_reason'),
                 next_run_at=ensure_utc_timestamp(row_dict.get('next_run_at')),
                 attempts=row_dict.get('attempts', 0)
-            ))
+            )
+            # eta_sec comes from free-form payload JSON, and nullable columns
+            # may not match the declared types; skip validation only when
+            # they already do
+            if (
+                (eta_sec is None or type(eta_sec) is int)
+                and type(fields['attempts']) is int
+                and isinstance(fields['state'], str)
+            ):
+                items.append(JobItem.model_construct(**fields))
+            else:
+                items.append(JobItem.model_validate(fields))
         
-        return JobListResponse(
+        return model_response(JobListResponse.model_construct(
             items=items,
             page=page,
             per_page=per_page,
             total=total
-        )
+        ))
     except Exception as e:
         logger.error(f"Failed to list jobs: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -412,7 +427,7 @@ async def get_job_stats(
 async def get_active_jobs(
     limit: int = Query(default=10, le=100),
     db=Depends(get_db)
-) -> List[JobItem]:
+) -> ORJSONResponse:
     """Get currently active (running or queued) jobs"""
     try:
         cursor = await db.execute("""
@@ -463,7 +478,7 @@ async def get_active_jobs(
             
             jobs.append(JobItem(**job))
         
-        return jobs
+        return ORJSONResponse(_JOB_ITEMS_ADAPTER.dump_json(jobs))
     except Exception as e:
         logger.error(f"Failed to get active jobs: {e}")
         raise HTTPException(status_code=500, detail=str(e))
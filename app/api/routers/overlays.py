@@ -8,15 +8,27 @@ import logging
 
 from app.api.schemas.overlays import (
     OverlayResponse, OverlayCreate, OverlayUpdate, OverlayListResponse,
-    OverlaySearchQuery, OverlayPreview, OverlayManifest, OverlayStatus, OverlayType
+    OverlaySearchQuery, OverlayPreview, OverlayManifest, OverlayStatus, OverlayType,
+    OVERLAY_STATUS_BY_VALUE, OVERLAY_TYPE_BY_VALUE
 )
 from app.api.db.database import get_db
+from app.api.responses import ORJSONResponse, model_response
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+def _overlay_type(value: str) -> OverlayType:
+    """Map a stored type string to its enum member"""
+    return OVERLAY_TYPE_BY_VALUE.get(value) or OverlayType(value)
+
+
+def _overlay_status(value: str) -> OverlayStatus:
+    """Map a stored status string to its enum member"""
+    return OVERLAY_STATUS_BY_VALUE.get(value) or OverlayStatus(value)
+
+
 @router.get("/", response_model=OverlayListResponse)
 async def list_overlays(
     page: int = Query(1, ge=1, description="Page number"),
@@ -28,7 +40,7 @@ async def list_overlays(
     tags: Optional[List[str]] = Query(None, description="Filter by tags"),
     search: Optional[str] = Query(None, description="Search query"),
     db=Depends(get_db)
-) -> OverlayListResponse:
+) -> ORJSONResponse:
     """List overlays with filtering and pagination"""
     try:
         query = "SELECT * FROM so_overlays WHERE 1=1"
@@ -66,14 +78,14 @@ async def list_overlays(
             overlays.append(OverlayResponse(
                 id=row[0],
                 name=row[1],
-                overlay_type=OverlayType(manifest.get('type', 'text')),
+                overlay_type=_overlay_type(manifest.get('type', 'text')),
                 description=manifest.get('description', ''),
                 position=manifest.get('position', {"x": 0, "y": 0, "z_index": 1}),
                 style=manifest.get('style', {}),
                 content=manifest.get('content', {}),
                 schedule=manifest.get('schedule'),
                 enabled=row[3] == 1,
-                status=OverlayStatus(row[4]) if row[4] else OverlayStatus.inactive,
+                status=_overlay_status(row[4]) if row[4] else OverlayStatus.inactive,
                 tags=json.loads(manifest.get('tags', '[]')) if manifest.get('tags') else [],
                 scene_filter=manifest.get('scene_filter'),
                 views=manifest.get('views', 0),
@@ -82,12 +94,12 @@ async def list_overlays(
                 updated_at=datetime.fromisoformat(row[6])
             ))
         
-        return OverlayListResponse(
+        return model_response(OverlayListResponse.model_construct(
             overlays=overlays,
             total=total,
             page=page,
             per_page=per_page
-        )
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch overlays: {str(e)}")
 
@@ -173,14 +185,14 @@ async def get_overlay(overlay_id: str, db=Depends(get_db)) -> OverlayResponse:
         return OverlayResponse(
             id=row[0],
             name=row[1],
-            overlay_type=OverlayType(manifest.get('type', 'text')),
+            overlay_type=_overlay_type(manifest.get('type', 'text')),
             description=manifest.get('description', ''),
             position=manifest.get('position', {"x": 0, "y": 0, "z_index": 1}),
             style=manifest.get('style', {}),
             content=manifest.get('content', {}),
             schedule=manifest.get('schedule'),
             enabled=row[3] == 1,
-            status=OverlayStatus(row[4]) if row[4] else OverlayStatus.inactive,
+            status=_overlay_status(row[4]) if row[4] else OverlayStatus.inactive,
             tags=json.loads(manifest.get('tags', '[]')) if manifest.get('tags') else [],
             scene_filter=manifest.get('scene_filter'),
             views=manifest.get('views', 0),
@@ -257,7 +269,7 @@ async def update_overlay(
         return OverlayResponse(
             id=overlay_id,
             name=name,
-            overlay_type=OverlayType(existing_manifest.get('type', 'text')),
+            overlay_type=_overlay_type(existing_manifest.get('type', 'text')),
             description=existing_manifest.get('description', ''),
             position=existing_manifest.get('position', {"x": 0, "y": 0, "z_index": 1}),
             style=existing_manifest.get('style', {}),
@@ -486,7 +498,7 @@ async def search_overlays(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(50, ge=1, le=100, description="Items per page"),
     db=Depends(get_db)
-) -> OverlayListResponse:
+) -> ORJSONResponse:
     """Advanced overlay search with multiple filters"""
     try:
         # Build search query
@@ -532,14 +544,14 @@ async def search_overlays(
             overlays.append(OverlayResponse(
                 id=row[0],
                 name=row[1],
-                overlay_type=OverlayType(manifest.get('type', 'text')),
+                overlay_type=_overlay_type(manifest.get('type', 'text')),
                 description=manifest.get('description', ''),
                 position=manifest.get('position', {"x": 0, "y": 0, "z_index": 1}),
                 style=manifest.get('style', {}),
                 content=manifest.get('content', {}),
                 schedule=manifest.get('schedule'),
                 enabled=row[3] == 1,
-                status=OverlayStatus(row[4]) if row[4] else OverlayStatus.inactive,
+                status=_overlay_status(row[4]) if row[4] else OverlayStatus.inactive,
                 tags=json.loads(manifest.get('tags', '[]')) if manifest.get('tags') else [],
                 scene_filter=manifest.get('scene_filter'),
                 views=manifest.get('views', 0),
@@ -548,12 +560,12 @@ async def search_overlays(
                 updated_at=datetime.fromisoformat(row[6])
             ))
         
-        return OverlayListResponse(
+        return model_response(OverlayListResponse.model_construct(
             overlays=overlays,
             total=total,
             page=page,
             per_page=per_page
-        )
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Overlay search failed: {str(e)}")
 
@@ -14,12 +14,26 @@ from app.api.schemas.reports import (
     WeeklySummaryReport, AssetSummaryReport, JobPerformanceReport, SystemUtilizationReport
 )
 from app.api.db.database import get_db
+from app.api.responses import ORJSONResponse, model_response
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+def _report_item(**fields) -> ReportResponse:
+    """Build a list item, validating it only if report_meta values are off-type
+    
+    The enums and dates are parsed by the caller; file_path and size_bytes come
+    straight from the stored report_meta JSON.
+    """
+    file_path = fields.get('file_path')
+    size_bytes = fields.get('size_bytes')
+    if (file_path is None or isinstance(file_path, str)) and (size_bytes is None or type(size_bytes) is int):
+        return ReportResponse.model_construct(**fields)
+    return ReportResponse(**fields)
+
+
 @router.get("/", response_model=ReportListResponse)
 async def list_reports(
     page: int = Query(1, ge=1, description="Page number"),
@@ -28,7 +42,7 @@ async def list_reports(
     format: Optional[ReportFormat] = Query(None, description="Filter by format"),
     period: Optional[ReportPeriod] = Query(None, description="Filter by period"),
     db=Depends(get_db)
-) -> ReportListResponse:
+) -> ORJSONResponse:
     """List generated reports with filtering and pagination"""
     try:
         query = "SELECT * FROM so_reports WHERE 1=1"
@@ -76,7 +90,7 @@ async def list_reports(
             # Extract report metadata from JSON
             report_meta = top_games.get('report_meta', {})
             
-            reports.append(ReportResponse(
+            reports.append(_report_item(
                 id=row[0],
                 report_type=ReportType(report_meta.get('type', 'weekly_summary')),
                 format=ReportFormat(report_meta.get('format', 'json')),
@@ -90,12 +104,12 @@ async def list_reports(
                 expires_at=datetime.fromisoformat(report_meta['expires_at']) if report_meta.get('expires_at') else None
             ))
         
-        return ReportListResponse(
+        return model_response(ReportListResponse.model_construct(
             reports=reports,
             total=len(reports),
             page=page,
             per_page=per_page
-        )
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch reports: {str(e)}")
 
@@ -319,7 +333,7 @@ async def search_reports(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(50, ge=1, le=100, description="Items per page"),
     db=Depends(get_db)
-) -> ReportListResponse:
+) -> ORJSONResponse:
     """Advanced report search with multiple filters"""
     try:
         # Build search query
@@ -361,7 +375,7 @@ async def search_reports(
             top_games = json.loads(row[3]) if row[3] else {}
             report_meta = top_games.get('report_meta', {})
             
-            reports.append(ReportResponse(
+            reports.append(_report_item(
                 id=row[0],
                 report_type=ReportType(report_meta.get('type', 'weekly_summary')),
                 format=ReportFormat(report_meta.get('format', 'json')),
@@ -373,12 +387,12 @@ async def search_reports(
                 size_bytes=report_meta.get('size_bytes', 0)
             ))
         
-        return ReportListResponse(
+        return model_response(ReportListResponse.model_construct(
             reports=reports,
             total=total,
             page=page,
             per_page=per_page
-        )
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Report search failed: {str(e)}")
 
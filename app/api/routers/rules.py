@@ -2,7 +2,7 @@ from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks, B
 from fastapi.responses import JSONResponse
 from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime, timedelta, time
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, TypeAdapter, validator
 import uuid
 import json
 import os
@@ -12,6 +12,7 @@ import aiosqlite
 from pathlib import Path
 
 from app.api.db.database import get_db
+from app.api.responses import ORJSONResponse, model_response
 
 logger = logging.getLogger(__name__)
 
@@ -113,6 +114,8 @@ class PresetResponse(BaseModel):
     defaults: Dict[str, Any]
     enabled: bool = False
 
+_PRESETS_ADAPTER = TypeAdapter(List[PresetResponse])
+
 # Rule presets
 RULE_PRESETS = [
     {
@@ -432,7 +435,7 @@ async def get_rule_metadata() -> Dict[str, Any]:
     return RULE_METADATA
 
 @router.get("/presets", response_model=List[PresetResponse])
-async def get_rule_presets(db=Depends(get_db)) -> List[PresetResponse]:
+async def get_rule_presets(db=Depends(get_db)) -> ORJSONResponse:
     """Get available rule presets with their enabled status"""
     try:
         # Get all rules to check which presets are enabled
@@ -458,7 +461,7 @@ async def get_rule_presets(db=Depends(get_db)) -> List[PresetResponse]:
                 enabled=preset['id'] in enabled_presets
             ))
         
-        return presets
+        return ORJSONResponse(_PRESETS_ADAPTER.dump_json(presets))
     except Exception as e:
         logger.error(f"Failed to get rule presets: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -469,7 +472,7 @@ async def list_rules(
     per_page: int = Query(50, ge=1, le=100, description="Items per page"),
     enabled: Optional[bool] = Query(None, description="Filter by enabled status"),
     db=Depends(get_db)
-) -> RuleListResponse:
+) -> ORJSONResponse:
     """List all rules with pagination"""
     try:
         query = """SELECT 
@@ -518,9 +521,11 @@ async def list_rules(
                 "created_at": row[13] if row[13] else datetime.utcnow().isoformat(),
                 "updated_at": row[14] if row[14] else datetime.utcnow().isoformat()
             }
-            rules.append(RuleResponse(**rule))
+            # The JSON columns can hold any shape, so each rule is validated;
+            # only the page wrapper is built without a second pass
+            rules.append(RuleResponse.model_validate(rule))
         
-        return RuleListResponse(rules=rules, total=total)
+        return model_response(RuleListResponse.model_construct(rules=rules, total=total))
     except Exception as e:
         logger.error(f"Failed to list rules: {e}")
         raise HTTPException(status_code=500, detail=str(e))
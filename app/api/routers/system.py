@@ -20,6 +20,22 @@ from app.api.services.gpu_service import gpu_service
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Number of asset paths checked per worker thread during a full reindex
+REINDEX_EXISTS_CHUNK = 1024
+
+
+def _resolve_asset_paths(assets: List[tuple]) -> List[Optional[str]]:
+    """Return the path each (id, abs_path, current_path) asset is found at, or None if missing"""
+    resolved = []
+    for _, abs_path, current_path in assets:
+        if current_path and os.path.exists(current_path):
+            resolved.append(current_path)
+        elif os.path.exists(abs_path):
+            resolved.append(abs_path)
+        else:
+            resolved.append(None)
+    return resolved
+
 
 class MountInfo(BaseModel):
     """Mount point information"""
@@ -780,29 +796,29 @@ async def perform_system_action(
                 )
                 assets = await cursor.fetchall()
                 
-                # Check which files still exist
+                # Check which files still exist, in parallel worker threads so slow
+                # network storage does not stall the event loop
                 removed_count = 0
                 checked_count = 0
                 
-                for asset_id, abs_path, current_path in assets:
+                chunks = [assets[i:i + REINDEX_EXISTS_CHUNK] for i in range(0, len(assets), REINDEX_EXISTS_CHUNK)]
+                chunk_results = await asyncio.gather(
+                    *(asyncio.to_thread(_resolve_asset_paths, chunk) for chunk in chunks)
+                )
+                resolved_paths = [path for result in chunk_results for path in result]
+                
+                for (asset_id, abs_path, current_path), actual_path in zip(assets, resolved_paths):
                     checked_count += 1
-                    # Check if file exists at either the original path or current path
-                    file_exists = False
-                    actual_path = None
+                    # File exists at either the original path or current path
+                    file_exists = actual_path is not None
                     
-                    if current_path and os.path.exists(current_path):
-                        file_exists = True
-                        actual_path = current_path
-                    elif os.path.exists(abs_path):
-                        file_exists = True
-                        actual_path = abs_path
+                    if actual_path == abs_path and current_path != abs_path:
                         # Update current_path if file is at original location but current_path is different
-                        if current_path != abs_path:
-                            await db.execute(
-                                "UPDATE so_assets SET current_path = ? WHERE id = ?",
-                                (abs_path, asset_id)
-                            )
-                            logger.info(f"Updated current_path for asset {asset_id} to {abs_path}")
+                        await db.execute(
+                            "UPDATE so_assets SET current_path = ? WHERE id = ?",
+                            (abs_path, asset_id)
+                        )
+                        logger.info(f"Updated current_path for asset {asset_id} to {abs_path}")
                     
                     if not file_exists:
                         # File no longer exists at either path, remove it and its related data
@@ -856,8 +872,12 @@ async def perform_system_action(
                 scanned = 0
                 nats_service = request.app.state.nats if hasattr(request.app.state, 'nats') else None
                 
-                for drive_id, drive_path in drives:
-                    if os.path.exists(drive_path):
+                drives_exist = await asyncio.gather(
+                    *(asyncio.to_thread(os.path.exists, drive_path) for _, drive_path in drives)
+                )
+                
+                for (drive_id, drive_path), drive_exists in zip(drives, drives_exist):
+                    if drive_exists:
                         logger.info(f"Queuing rescan for drive {drive_id}: {drive_path}")
                         
                         # Queue an index job for each drive path
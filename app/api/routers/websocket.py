@@ -9,23 +9,58 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Maximum number of messages buffered per client before the oldest are dropped
+SEND_QUEUE_MAXSIZE = 1024
+
 # Store active WebSocket connections
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Set[WebSocket] = set()
         self.subscriptions: Dict[WebSocket, Set[str]] = {}
+        self.send_queues: Dict[WebSocket, asyncio.Queue] = {}
+        self.writer_tasks: Dict[WebSocket, asyncio.Task] = {}
     
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SEND_QUEUE_MAXSIZE)
         self.active_connections.add(websocket)
         self.subscriptions[websocket] = set()
+        self.send_queues[websocket] = queue
+        self.writer_tasks[websocket] = asyncio.create_task(self._writer(websocket, queue))
         logger.info(f"WebSocket connected. Total connections: {len(self.active_connections)}")
     
     def disconnect(self, websocket: WebSocket):
         self.active_connections.discard(websocket)
         self.subscriptions.pop(websocket, None)
+        self.send_queues.pop(websocket, None)
+        task = self.writer_tasks.pop(websocket, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
         logger.info(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
     
+    async def _writer(self, websocket: WebSocket, queue: asyncio.Queue):
+        """Drain a client's send queue so a slow reader never blocks other clients"""
+        try:
+            while True:
+                message = await queue.get()
+                await websocket.send_text(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error sending message to client: {e}")
+            self.disconnect(websocket)
+    
+    def _enqueue(self, websocket: WebSocket, message: str):
+        """Queue a message for a client, dropping the oldest one if the queue is full"""
+        queue = self.send_queues.get(websocket)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            queue.get_nowait()
+            queue.put_nowait(message)
+    
     def subscribe(self, websocket: WebSocket, channels: list):
         """Subscribe a websocket to specific channels"""
         if websocket in self.subscriptions:
@@ -40,29 +75,16 @@ class ConnectionManager:
     
     async def send_personal_message(self, message: str, websocket: WebSocket):
         """Send a message to a specific client"""
-        try:
-            await websocket.send_text(message)
-        except Exception as e:
-            logger.error(f"Error sending message to client: {e}")
-            self.disconnect(websocket)
+        self._enqueue(websocket, message)
     
     async def broadcast(self, message: str, channel: str = None):
         """Broadcast a message to all connected clients or those subscribed to a channel"""
-        disconnected = []
-        for connection in self.active_connections:
+        for connection in list(self.active_connections):
             # If channel specified, only send to subscribed clients
             if channel and channel not in self.subscriptions.get(connection, set()):
                 continue
             
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting to client: {e}")
-                disconnected.append(connection)
-        
-        # Clean up disconnected clients
-        for conn in disconnected:
-            self.disconnect(conn)
+            self._enqueue(connection, message)
     
     async def broadcast_event(self, event_type: str, payload: Dict[str, Any], channel: str = None):
         """Broadcast an event with payload"""
@@ -1,19 +1,92 @@
 """Setup wizard endpoints for zero-configuration"""
 import os
-import json
+import asyncio
 import logging
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+import stat
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, Any, List, Optional
 from pathlib import Path
 from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel, Field
-import aiofiles
 
 from app.api.db.database import get_db
+from app.api.responses import ORJSONResponse
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Folder names (lowercased) that suggest recording or editing locations on a drive
+RECORDING_SET = frozenset(("recordings", "videos", "obs", "stream", "captures"))
+EDITING_SET = frozenset(("editing", "projects", "export", "final"))
+
+# Mount roots suggested when no named folders are found, in order of preference
+_FALLBACK_RECORDING_CANDIDATES: tuple[str, ...] = ("/mnt/recordings", "/mnt/drive_a")
+_FALLBACK_EDITING_CANDIDATES: tuple[str, ...] = ("/mnt/drive_f", "/mnt/drive_d")
+
+# Seconds to wait for a single drive to list before treating it as unreachable
+_PROBE_TIMEOUT = 1.0
+
+# A thread listing a hung mount cannot be cancelled, so probes get their own
+# small pool rather than tying up the default executor
+_PROBE_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="wizard-probe")
+# Mounts whose timed-out probe is still running; not probed again until it ends
+_stuck_probes: set[str] = set()
+
+# Set once the essential drive roles have been confirmed in the database
+_roles_verified: bool = False
+
+# Wizard defaults are re-fetched on every step, cache them briefly
+_DEFAULTS_TTL = 10.0
+_defaults_cache: Optional[tuple[float, "WizardDefaults"]] = None
+
+# Recommended rule presets
+_DEFAULT_RULES: List[Dict[str, Any]] = [
+    {
+        "id": "remux_move_proxy",
+        "label": "Remux to MOV, Move to Editing, Create Proxies",
+        "description": "Remux MKV files to MOV with faststart, move to editing drive, and create proxy files for clips longer than 15 minutes",
+        "enabled_by_default": True,
+        "parameters": {
+            "container": "mov",
+            "faststart": True,
+            "proxy_min_duration_sec": 900
+        }
+    },
+    {
+        "id": "archive_old",
+        "label": "Archive Old Recordings",
+        "description": "Move recordings older than 90 days to archive storage",
+        "enabled_by_default": False,
+        "parameters": {
+            "days_old": 90,
+            "delete_after_archive": False
+        }
+    }
+]
+
+# Available overlay presets
+_DEFAULT_OVERLAY_PRESETS: List[Dict[str, Any]] = [
+    {
+        "id": "sponsor_rotator",
+        "label": "Sponsor Rotator",
+        "description": "Rotate sponsor logos in corner of stream",
+        "positions": ["top-left", "top-right", "bottom-left", "bottom-right"],
+        "default_position": "bottom-right",
+        "default_margin": 20
+    },
+    {
+        "id": "now_playing",
+        "label": "Now Playing",
+        "description": "Show current music track",
+        "positions": ["top", "bottom"],
+        "default_position": "bottom",
+        "default_margin": 10
+    }
+]
+
 
 class WizardDriveConfig(BaseModel):
     """Drive role assignment from wizard"""
@@ -70,6 +143,16 @@ class WizardDefaults(BaseModel):
     overlay_presets: List[Dict[str, Any]] = Field(..., description="Available overlay presets")
 
 
+# Validated once; per-request values are filled in with model_copy
+_DEFAULTS_PROTOTYPE = WizardDefaults(
+    recording_paths=[],
+    editing_paths=[],
+    obs_url="",
+    rules=_DEFAULT_RULES,
+    overlay_presets=_DEFAULT_OVERLAY_PRESETS
+)
+
+
 class WizardState(BaseModel):
     """Wizard completion state"""
     completed: bool = Field(..., description="Whether wizard has been completed")
@@ -77,110 +160,158 @@ class WizardState(BaseModel):
     version: str = Field(..., description="Wizard version")
 
 
-@router.get("/defaults", response_model=WizardDefaults)
+# Shared response for every "wizard not completed" branch
+_INCOMPLETE_STATE = WizardState(completed=False, last_completed_at=None, version="1.0.0")
+
+
+async def _verify_roles(db) -> bool:
+    """Check that recording and editing roles are assigned, remembering success"""
+    global _roles_verified
+    
+    if _roles_verified:
+        return True
+    
+    cursor = await db.execute("""
+        SELECT COUNT(*) 
+        FROM so_roles 
+        WHERE role IN ('recording', 'editing')
+    """)
+    count = await cursor.fetchone()
+    _roles_verified = bool(count and count[0] >= 2)
+    return _roles_verified
+
+
+def invalidate_roles_verified() -> None:
+    """Force the next wizard state check to re-read drive roles"""
+    global _roles_verified
+    _roles_verified = False
+
+
+def _completed_at(request: Request, value: Optional[str]) -> Optional[datetime]:
+    """Parse the wizard completion timestamp, memoized on app.state"""
+    if not value:
+        return None
+    cached = getattr(request.app.state, "wizard_state_dt", None)
+    if cached is not None and cached[0] == value:
+        return cached[1]
+    parsed = datetime.fromisoformat(value)
+    request.app.state.wizard_state_dt = (value, parsed)
+    return parsed
+
+
+def _dir_exists(path: str) -> bool:
+    """Check for a directory with a single lstat, without resolving symlinks"""
+    try:
+        return stat.S_ISDIR(os.stat(path, follow_symlinks=False).st_mode)
+    except OSError:
+        return False
+
+
+def _list_mounts() -> list[str]:
+    """List candidate drive mounts under /mnt (blocking)"""
+    if not _dir_exists("/mnt"):
+        return []
+    with os.scandir("/mnt") as entries:
+        return [
+            entry.path for entry in entries
+            if entry.is_dir() and not entry.name.startswith('.')
+        ]
+
+
+def _probe_drive(path: str) -> tuple[list[str], list[str]]:
+    """Find recording and editing folders directly under a drive (blocking)"""
+    # List the drive once and match common folder names
+    try:
+        with os.scandir(path) as entries:
+            subdirs = [
+                (child.name.lower(), child.path) for child in entries
+                if child.is_dir(follow_symlinks=False)
+            ]
+    except OSError:
+        return [], []
+    
+    return (
+        [child_path for name, child_path in subdirs if name in RECORDING_SET],
+        [child_path for name, child_path in subdirs if name in EDITING_SET]
+    )
+
+
+def _first_dir(candidates: tuple[str, ...]) -> Optional[str]:
+    """Return the first candidate path that is a directory (blocking)"""
+    return next((p for p in candidates if _dir_exists(p)), None)
+
+
+async def _probe_drive_bounded(path: str) -> tuple[list[str], list[str]]:
+    """Probe a drive in a worker thread, skipping it if it does not answer in time"""
+    if path in _stuck_probes:
+        logger.warning(f"Earlier probe of {path} has not finished, skipping")
+        return [], []
+    
+    future = asyncio.get_running_loop().run_in_executor(_PROBE_EXECUTOR, _probe_drive, path)
+    try:
+        # Shielded so the timeout leaves the future running to report when
+        # the thread is finally free
+        return await asyncio.wait_for(asyncio.shield(future), timeout=_PROBE_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(f"Timed out probing {path} for wizard defaults, skipping")
+        _stuck_probes.add(path)
+        future.add_done_callback(lambda _: _stuck_probes.discard(path))
+        return [], []
+
+
+async def _scan_mnt() -> tuple[list[str], list[str]]:
+    """Find likely recording and editing folders under /mnt without blocking the event loop"""
+    # Probe all mounts concurrently, each with its own deadline
+    mounts = await asyncio.to_thread(_list_mounts)
+    results = await asyncio.gather(*(_probe_drive_bounded(mount) for mount in mounts))
+    recording_paths = [p for found_recording, _ in results for p in found_recording]
+    editing_paths = [p for _, found_editing in results for p in found_editing]
+    
+    # If no specific folders found, suggest mount roots
+    if not recording_paths:
+        fallback = await asyncio.to_thread(_first_dir, _FALLBACK_RECORDING_CANDIDATES)
+        if fallback:
+            recording_paths.append(fallback)
+        
+    if not editing_paths:
+        fallback = await asyncio.to_thread(_first_dir, _FALLBACK_EDITING_CANDIDATES)
+        if fallback:
+            editing_paths.append(fallback)
+    
+    return recording_paths, editing_paths
+
+
+@router.get("/defaults", response_model=WizardDefaults, response_class=ORJSONResponse)
 async def get_wizard_defaults() -> WizardDefaults:
     """Get wizard default suggestions based on system inspection"""
+    global _defaults_cache
+    
+    if _defaults_cache is not None and time.monotonic() - _defaults_cache[0] < _DEFAULTS_TTL:
+        return _defaults_cache[1]
+    
     try:
-        recording_paths = []
-        editing_paths = []
-        
-        # Look for common recording folders
-        common_recording_names = ["Recordings", "Videos", "OBS", "Stream", "Captures"]
-        common_editing_names = ["Editing", "Projects", "Export", "Final"]
-        
-        # Scan mounted drives
-        if os.path.exists("/mnt"):
-            for entry in os.scandir("/mnt"):
-                if entry.is_dir() and not entry.name.startswith('.'):
-                    path = entry.path
-                    
-                    # Check for recording folders
-                    for rec_name in common_recording_names:
-                        rec_path = os.path.join(path, rec_name)
-                        if os.path.exists(rec_path):
-                            recording_paths.append(rec_path)
-                    
-                    # Check for editing folders
-                    for edit_name in common_editing_names:
-                        edit_path = os.path.join(path, edit_name)
-                        if os.path.exists(edit_path):
-                            editing_paths.append(edit_path)
-        
-        # If no specific folders found, suggest mount roots
-        if not recording_paths and os.path.exists("/mnt/recordings"):
-            recording_paths.append("/mnt/recordings")
-        elif not recording_paths and os.path.exists("/mnt/drive_a"):
-            recording_paths.append("/mnt/drive_a")
-            
-        if not editing_paths and os.path.exists("/mnt/drive_f"):
-            editing_paths.append("/mnt/drive_f")
-        elif not editing_paths and os.path.exists("/mnt/drive_d"):
-            editing_paths.append("/mnt/drive_d")
+        # Drive scanning can block on slow network mounts, keep it off the event loop
+        recording_paths, editing_paths = await _scan_mnt()
         
         # Get OBS configuration from environment or use defaults
         obs_url = os.getenv("OBS_WS_URL", "ws://host.docker.internal:4455")
         obs_password = os.getenv("OBS_WS_PASSWORD", "")
         
-        # Recommended rule presets
-        rules = [
-            {
-                "id": "remux_move_proxy",
-                "label": "Remux to MOV, Move to Editing, Create Proxies",
-                "description": "Remux MKV files to MOV with faststart, move to editing drive, and create proxy files for clips longer than 15 minutes",
-                "enabled_by_default": True,
-                "parameters": {
-                    "container": "mov",
-                    "faststart": True,
-                    "proxy_min_duration_sec": 900
-                }
-            },
-            {
-                "id": "archive_old",
-                "label": "Archive Old Recordings",
-                "description": "Move recordings older than 90 days to archive storage",
-                "enabled_by_default": False,
-                "parameters": {
-                    "days_old": 90,
-                    "delete_after_archive": False
-                }
-            }
-        ]
-        
-        # Available overlay presets
-        overlay_presets = [
-            {
-                "id": "sponsor_rotator",
-                "label": "Sponsor Rotator",
-                "description": "Rotate sponsor logos in corner of stream",
-                "positions": ["top-left", "top-right", "bottom-left", "bottom-right"],
-                "default_position": "bottom-right",
-                "default_margin": 20
-            },
-            {
-                "id": "now_playing",
-                "label": "Now Playing",
-                "description": "Show current music track",
-                "positions": ["top", "bottom"],
-                "default_position": "bottom",
-                "default_margin": 10
-            }
-        ]
-        
-        return WizardDefaults(
-            recording_paths=recording_paths,
-            editing_paths=editing_paths,
-            obs_url=obs_url,
-            obs_password=obs_password,
-            rules=rules,
-            overlay_presets=overlay_presets
-        )
+        defaults = _DEFAULTS_PROTOTYPE.model_copy(update={
+            "recording_paths": recording_paths,
+            "editing_paths": editing_paths,
+            "obs_url": obs_url,
+            "obs_password": obs_password
+        })
+        _defaults_cache = (time.monotonic(), defaults)
+        return defaults
         
     except Exception as e:
         logger.error(f"Failed to get wizard defaults: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get wizard defaults: {str(e)}")
 
 
-@router.get("/state", response_model=WizardState)
+@router.get("/state", response_model=WizardState, response_class=ORJSONResponse)
 async def get_wizard_state(request: Request, db=Depends(get_db)) -> WizardState:
     """Get wizard completion state"""
     try:
@@ -193,50 +324,27 @@ async def get_wizard_state(request: Request, db=Depends(get_db)) -> WizardState:
         if wizard_config and wizard_config.get("completed", False):
             # Check if essential drives are configured in the database
             try:
-                cursor = await db.execute("""
-                    SELECT COUNT(*) 
-                    FROM so_roles 
-                    WHERE role IN ('recording', 'editing')
-                """)
-                count = await cursor.fetchone()
-                
                 # If essential drives are missing, wizard is not complete
-                if not count or count[0] < 2:
+                if not await _verify_roles(db):
                     logger.info("Wizard marked complete but essential drives missing - resetting wizard state")
-                    return WizardState(
-                        completed=False,
-                        last_completed_at=None,
-                        version="1.0.0"
-                    )
+                    return _INCOMPLETE_STATE
                     
             except Exception as db_error:
                 logger.warning(f"Could not verify drive configuration: {db_error}")
                 # If we can't verify, assume wizard needs to run
-                return WizardState(
-                    completed=False,
-                    last_completed_at=None,
-                    version="1.0.0"
-                )
+                return _INCOMPLETE_STATE
             
             return WizardState(
                 completed=wizard_config.get("completed", False),
-                last_completed_at=datetime.fromisoformat(wizard_config["last_completed_at"]) if wizard_config.get("last_completed_at") else None,
+                last_completed_at=_completed_at(request, wizard_config.get("last_completed_at")),
                 version=wizard_config.get("version", "1.0.0")
             )
         else:
-            return WizardState(
-                completed=False,
-                last_completed_at=None,
-                version="1.0.0"
-            )
+            return _INCOMPLETE_STATE
             
     except Exception as e:
         logger.error(f"Failed to get wizard state: {e}")
-        return WizardState(
-            completed=False,
-            last_completed_at=None,
-            version="1.0.0"
-        )
+        return _INCOMPLETE_STATE
 
 
 @router.post("/apply")
@@ -246,21 +354,29 @@ async def apply_wizard_config(
     db=Depends(get_db)
 ) -> Dict[str, Any]:
     """Apply wizard configuration - creates drives, rules, and starts watchers"""
+    global _defaults_cache
+    
     try:
         config_service = request.app.state.config
         applied_items = []
+        log_lines = []
+        # Single timestamp shared by every config write in this apply
+        now_iso = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+00:00")
         
         # 1. Drive roles are already configured in the database from the WizardDrives component
-        # Just log what we received
+        # Just log what we received and index the drives by role
+        drives_grouped: Dict[str, List[WizardDriveConfig]] = defaultdict(list)
         for drive_role in wizard_request.drives:
+            drives_grouped[drive_role.role].append(drive_role)
             applied_items.append(f"Drive role: {drive_role.role} -> {drive_role.abs_path}")
-            logger.info(f"Drive role configured: {drive_role.role} at {drive_role.abs_path}")
+            log_lines.append(f"Drive role configured: {drive_role.role} at {drive_role.abs_path}")
+        drives_by_role = {role: drives[0] for role, drives in drives_grouped.items()}
         
         # 2. OBS connections are already in the database from the WizardOBS component
         # Just log what we have
         if wizard_request.obs:
             for obs_conn in wizard_request.obs:
-                logger.info(f"OBS connection: {obs_conn.name} at {obs_conn.ws_url}")
+                log_lines.append(f"OBS connection: {obs_conn.name} at {obs_conn.ws_url}")
                 applied_items.append(f"OBS: {obs_conn.name}")
         
         # 3. Create rules from presets
@@ -273,66 +389,80 @@ async def apply_wizard_config(
                 rule_json = await create_rule_from_preset(
                     rule_config.id,
                     rule_config.parameters,
-                    wizard_request.drives
+                    drives_by_role
                 )
                 
-                # Insert rule into database
-                await db.execute(
+                # Rules from an earlier wizard run are kept as they are; one
+                # failing insert does not stop the others
+                cursor = await db.execute(
                     """INSERT INTO so_rules 
                        (id, name, enabled, priority, when_json, do_json, created_at, updated_at)
-                       VALUES (?, ?, 1, ?, ?, ?, datetime('now'), datetime('now'))""",
+                       VALUES (?, ?, 1, ?, ?, ?, datetime('now'), datetime('now'))
+                       ON CONFLICT(id) DO NOTHING""",
                     (
                         f"wizard_{rule_config.id}",
                         rule_json["name"],
                         rule_json.get("priority", 100),
-                        json.dumps(rule_json.get("when", {})),
-                        json.dumps(rule_json.get("do", []))
+                        rule_json.get("when", {}),
+                        rule_json.get("do", [])
                     )
                 )
-                applied_items.append(f"Rule: {rule_json['name']}")
+                if cursor.rowcount:
+                    applied_items.append(f"Rule: {rule_json['name']}")
+                else:
+                    log_lines.append(f"Rule already exists, left unchanged: {rule_json['name']}")
             except Exception as e:
                 logger.error(f"Failed to create rule {rule_config.id}: {e}")
         
         await db.commit()
         
+        config_updates = {}
+        
         # 4. Configure overlays if enabled
         if wizard_request.overlays.enabled and wizard_request.overlays.preset:
-            await config_service.set_config("overlays", {
+            config_updates["overlays"] = {
                 "enabled": True,
                 "preset": wizard_request.overlays.preset,
                 "position": wizard_request.overlays.position,
                 "margin": wizard_request.overlays.margin
-            })
+            }
             applied_items.append("Overlay configuration")
         
         # 5. Set guardrails to safe defaults
-        await config_service.set_config("guardrails", {
+        config_updates["guardrails"] = {
             "pause_if_recording": True,
             "pause_if_gpu_pct_above": 40,
             "pause_if_cpu_pct_above": 70,
             "require_disk_space_gb": 5
-        })
+        }
         applied_items.append("Safety guardrails")
         
         # 6. Mark wizard as completed
-        await config_service.set_config("wizard_state", {
+        config_updates["wizard_state"] = {
             "completed": True,
-            "last_completed_at": datetime.utcnow().isoformat(),
+            "last_completed_at": now_iso,
             "version": "1.0.0"
-        })
+        }
+        
+        # Persist all configuration changes in a single write
+        await config_service.set_configs(config_updates)
+        _defaults_cache = None
+        request.app.state.wizard_state_dt = None
+        invalidate_roles_verified()
         
         # 7. Start drive watchers
         # This would trigger the watcher service to restart
         # For now, we'll just log it
-        logger.info("Wizard configuration applied - watchers should be restarted")
+        log_lines.append("Watchers should be restarted")
         
         # 8. Schedule initial indexing of existing files
-        recording_drives = [d for d in wizard_request.drives if d.role == "recording"]
-        for drive in recording_drives:
+        for drive in drives_grouped.get("recording", []):
             # Queue indexing job
-            logger.info(f"Queueing indexing job for {drive.abs_path}")
+            log_lines.append(f"Queueing indexing job for {drive.abs_path}")
             # This would use NATS to queue the job
         
+        logger.info("Wizard configuration applied:\n%s", "\n".join(log_lines))
+        
         return {
             "success": True,
             "message": "Wizard configuration applied successfully",
@@ -349,87 +479,105 @@ async def apply_wizard_config(
         raise HTTPException(status_code=500, detail=f"Failed to apply wizard config: {str(e)}")
 
 
-async def create_rule_from_preset(
-    preset_id: str,
+def _build_remux_move_proxy(
     parameters: Dict[str, Any],
-    drives: List[WizardDriveConfig]
+    drives_by_role: Dict[str, WizardDriveConfig]
 ) -> Dict[str, Any]:
-    """Create a rule JSON from a preset and parameters"""
-    
+    """Build the remux, move to editing and proxy rule"""
     # Find editing drive path from role assignments
-    editing_drive = next((d for d in drives if d.role == "editing"), None)
+    editing_drive = drives_by_role.get("editing")
     editing_path = editing_drive.abs_path if editing_drive else "/mnt/editing"
     
-    if preset_id == "remux_move_proxy":
-        return {
-            "name": "Remux, Move and Create Proxies",
-            "description": "Automatically remux recordings, move to editing drive, and create proxy files",
-            "priority": 100,
-            "when": {
-                "all": [
-                    {"field": "event.type", "operator": "=", "value": "file.closed"},
-                    {"field": "file.extension", "operator": "in", "value": [".mkv", ".flv", ".ts"]},
-                    {"field": "file.size_mb", "operator": ">", "value": 10}
-                ]
+    return {
+        "name": "Remux, Move and Create Proxies",
+        "description": "Automatically remux recordings, move to editing drive, and create proxy files",
+        "priority": 100,
+        "when": {
+            "all": [
+                {"field": "event.type", "operator": "=", "value": "file.closed"},
+                {"field": "file.extension", "operator": "in", "value": [".mkv", ".flv", ".ts"]},
+                {"field": "file.size_mb", "operator": ">", "value": 10}
+            ]
+        },
+        "do": [
+            {
+                "action": "ffmpeg_remux",
+                "params": {
+                    "container": parameters.get("container", "mov"),
+                    "faststart": parameters.get("faststart", True)
+                }
             },
-            "do": [
-                {
-                    "action": "ffmpeg_remux",
-                    "params": {
-                        "container": parameters.get("container", "mov"),
-                        "faststart": parameters.get("faststart", True)
-                    }
-                },
-                {
-                    "action": "move",
-                    "params": {
-                        "target": f"{editing_path}/{{date}}/{{filename}}"
-                    }
-                },
-                {
-                    "action": "proxy",
-                    "params": {
-                        "codec": "dnxhr_lb",
-                        "if_duration_gt": parameters.get("proxy_min_duration_sec", 900)
-                    }
+            {
+                "action": "move",
+                "params": {
+                    "target": f"{editing_path}/{{date}}/{{filename}}"
+                }
+            },
+            {
+                "action": "proxy",
+                "params": {
+                    "codec": "dnxhr_lb",
+                    "if_duration_gt": parameters.get("proxy_min_duration_sec", 900)
                 }
-            ],
-            "guardrails": {
-                "pause_if_recording": True,
-                "pause_if_gpu_pct_above": 40
             }
+        ],
+        "guardrails": {
+            "pause_if_recording": True,
+            "pause_if_gpu_pct_above": 40
         }
+    }
+
+
+def _build_archive_old(
+    parameters: Dict[str, Any],
+    drives_by_role: Dict[str, WizardDriveConfig]
+) -> Dict[str, Any]:
+    """Build the archive old recordings rule"""
+    archive_drive = drives_by_role.get("archive")
+    archive_path = archive_drive.abs_path if archive_drive else "/mnt/archive"
     
-    elif preset_id == "archive_old":
-        archive_drive = next((d for d in drives if d.role == "archive"), None)
-        archive_path = archive_drive.abs_path if archive_drive else "/mnt/archive"
-        
-        return {
-            "name": "Archive Old Recordings",
-            "description": "Move old recordings to archive storage",
-            "priority": 200,
-            "schedule": "0 4 * * *",  # Daily at 4 AM
-            "when": {
-                "all": [
-                    {"field": "file.age_days", "operator": ">", "value": parameters.get("days_old", 90)},
-                    {"field": "file.archived", "operator": "=", "value": False}
-                ]
+    return {
+        "name": "Archive Old Recordings",
+        "description": "Move old recordings to archive storage",
+        "priority": 200,
+        "schedule": "0 4 * * *",  # Daily at 4 AM
+        "when": {
+            "all": [
+                {"field": "file.age_days", "operator": ">", "value": parameters.get("days_old", 90)},
+                {"field": "file.archived", "operator": "=", "value": False}
+            ]
+        },
+        "do": [
+            {
+                "action": "move",
+                "params": {
+                    "target": f"{archive_path}/{{year}}/{{month}}/{{filename}}"
+                }
             },
-            "do": [
-                {
-                    "action": "move",
-                    "params": {
-                        "target": f"{archive_path}/{{year}}/{{month}}/{{filename}}"
-                    }
-                },
-                {
-                    "action": "tag",
-                    "params": {
-                        "tag": "archived"
-                    }
+            {
+                "action": "tag",
+                "params": {
+                    "tag": "archived"
                 }
-            ]
-        }
-    
-    else:
-        raise ValueError(f"Unknown preset ID: {preset_id}")
\ No newline at end of file
+            }
+        ]
+    }
+
+
+# Rule builders by wizard preset ID
+_PRESET_BUILDERS: Dict[str, Callable[[Dict[str, Any], Dict[str, WizardDriveConfig]], Dict[str, Any]]] = {
+    "remux_move_proxy": _build_remux_move_proxy,
+    "archive_old": _build_archive_old,
+}
+
+
+async def create_rule_from_preset(
+    preset_id: str,
+    parameters: Dict[str, Any],
+    drives_by_role: Dict[str, WizardDriveConfig]
+) -> Dict[str, Any]:
+    """Create a rule JSON from a preset and parameters"""
+    builder = _PRESET_BUILDERS.get(preset_id)
+    if builder is None:
+        raise ValueError(f"Unknown preset ID: {preset_id}")
+    return builder(parameters, drives_by_role)
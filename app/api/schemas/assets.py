@@ -1,10 +1,10 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, validator, ConfigDict
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 
 
-class AssetStatus(str, Enum):
+class AssetStatus(StrEnum):
     """Asset processing status"""
     pending = "pending"
     processing = "processing"
@@ -14,7 +14,7 @@ class AssetStatus(str, Enum):
     archived = "archived"
 
 
-class AssetType(str, Enum):
+class AssetType(StrEnum):
     """Media asset type"""
     video = "video"
     audio = "audio"
@@ -64,8 +64,7 @@ class AssetResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
 
 class AssetListResponse(BaseModel):
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
@@ -23,8 +23,7 @@ class ConfigResponse(BaseModel):
     description: Optional[str] = None
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
 
 class ConfigBulkUpdate(BaseModel):
@@ -1,11 +1,11 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, validator, ConfigDict
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 from pathlib import Path
 
 
-class DriveStatus(str, Enum):
+class DriveStatus(StrEnum):
     """Drive status enumeration"""
     active = "active"
     inactive = "inactive"
@@ -14,7 +14,7 @@ class DriveStatus(str, Enum):
     disconnected = "disconnected"
 
 
-class WatcherStatus(str, Enum):
+class WatcherStatus(StrEnum):
     """Watcher status enumeration"""
     running = "running"
     stopped = "stopped"
@@ -22,7 +22,7 @@ class WatcherStatus(str, Enum):
     paused = "paused"
 
 
-class DriveType(str, Enum):
+class DriveType(StrEnum):
     """Drive type enumeration"""
     local = "local"
     network = "network"
@@ -95,8 +95,7 @@ class DriveResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
 
 class DriveListResponse(BaseModel):
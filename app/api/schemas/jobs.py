@@ -1,10 +1,10 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 
 
-class JobStatus(str, Enum):
+class JobStatus(StrEnum):
     """Job status enumeration"""
     pending = "pending"
     queued = "queued"
@@ -15,7 +15,7 @@ class JobStatus(str, Enum):
     retrying = "retrying"
 
 
-class JobPriority(str, Enum):
+class JobPriority(StrEnum):
     """Job priority levels"""
     low = "low"
     normal = "normal"
@@ -23,7 +23,7 @@ class JobPriority(str, Enum):
     critical = "critical"
 
 
-class JobType(str, Enum):
+class JobType(StrEnum):
     """Job type enumeration"""
     ffmpeg_remux = "ffmpeg_remux"
     ffmpeg_transcode = "ffmpeg_transcode"
@@ -76,8 +76,7 @@ class JobResponse(BaseModel):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
 
 class JobListResponse(BaseModel):
@@ -110,7 +109,11 @@ class JobStats(BaseModel):
     cancelled: int
     retrying: int
     
+    model_config = ConfigDict(defer_build=True)
+    
     
 class JobCancel(BaseModel):
     """Cancel job request"""
-    reason: Optional[str] = Field(None, description="Cancellation reason")
\ No newline at end of file
+    reason: Optional[str] = Field(None, description="Cancellation reason")
+    
+    model_config = ConfigDict(defer_build=True)
\ No newline at end of file
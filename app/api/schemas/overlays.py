@@ -1,10 +1,10 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, validator, ConfigDict
 from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 
 
-class OverlayStatus(str, Enum):
+class OverlayStatus(StrEnum):
     """Overlay status enumeration"""
     active = "active"
     inactive = "inactive"
@@ -13,7 +13,7 @@ class OverlayStatus(str, Enum):
     error = "error"
 
 
-class OverlayType(str, Enum):
+class OverlayType(StrEnum):
     """Overlay type enumeration"""
     text = "text"
     image = "image"
@@ -26,6 +26,12 @@ class OverlayType(str, Enum):
     chat_display = "chat_display"
 
 
+# Value -> member lookups for rows read back from the database; cheaper than
+# going through Enum.__call__ once per row
+OVERLAY_STATUS_BY_VALUE: Dict[str, OverlayStatus] = {m.value: m for m in OverlayStatus}
+OVERLAY_TYPE_BY_VALUE: Dict[str, OverlayType] = {m.value: m for m in OverlayType}
+
+
 class OverlayPosition(BaseModel):
     """Overlay position and size"""
     x: int = Field(..., description="X coordinate (pixels)")
@@ -112,8 +118,7 @@ class OverlayResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
 
 class OverlayListResponse(BaseModel):
@@ -1,10 +1,10 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date
-from enum import Enum
+from enum import StrEnum
 
 
-class ReportType(str, Enum):
+class ReportType(StrEnum):
     """Report type enumeration"""
     weekly_summary = "weekly_summary"
     asset_summary = "asset_summary"
@@ -16,7 +16,7 @@ class ReportType(str, Enum):
     storage_usage = "storage_usage"
 
 
-class ReportFormat(str, Enum):
+class ReportFormat(StrEnum):
     """Report output format"""
     json = "json"
     html = "html"
@@ -24,7 +24,7 @@ class ReportFormat(str, Enum):
     csv = "csv"
 
 
-class ReportPeriod(str, Enum):
+class ReportPeriod(StrEnum):
     """Report time period"""
     day = "day"
     week = "week"
@@ -77,8 +77,7 @@ class ReportResponse(BaseModel):
     size_bytes: Optional[int] = None
     expires_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
 
 class ReportData(BaseModel):
@@ -1,10 +1,12 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any, Union
+import re
+from functools import lru_cache
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Optional, List, Dict, Any, Literal, Union
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 
 
-class RuleStatus(str, Enum):
+class RuleStatus(StrEnum):
     """Rule status enumeration"""
     active = "active"
     inactive = "inactive"
@@ -12,7 +14,7 @@ class RuleStatus(str, Enum):
     error = "error"
 
 
-class RuleConditionOperator(str, Enum):
+class RuleConditionOperator(StrEnum):
     """Rule condition operators"""
     equals = "equals"
     not_equals = "not_equals"
@@ -27,42 +29,44 @@ class RuleConditionOperator(str, Enum):
     has_tag = "has_tag"
 
 
+@lru_cache(maxsize=1024)
+def _compile_pattern(pattern: str) -> re.Pattern:
+    """Compile a condition regex once per distinct pattern"""
+    return re.compile(pattern)
+
+
 class RuleCondition(BaseModel):
     """Rule condition definition"""
     field: str = Field(..., description="Field to check")
     operator: RuleConditionOperator = Field(..., description="Comparison operator")
     value: Union[str, int, float, bool] = Field(..., description="Value to compare against")
+    
+    @property
+    def pattern(self) -> re.Pattern:
+        """Compiled pattern for regex_match conditions"""
+        return _compile_pattern(str(self.value))
+
+
+ActionType = Literal[
+    'ffmpeg_remux', 'move', 'copy', 'index_asset', 'thumbs',
+    'proxy', 'transcode_preset', 'tag', 'overlay_update'
+]
+
+GuardrailType = Literal[
+    'pause_if_recording', 'pause_if_gpu_pct_above', 'pause_if_cpu_pct_above'
+]
 
 
 class RuleAction(BaseModel):
     """Rule action definition"""
-    action_type: str = Field(..., description="Type of action to perform")
+    action_type: ActionType = Field(..., description="Type of action to perform")
     params: Dict[str, Any] = Field(default_factory=dict, description="Action parameters")
-    
-    @validator('action_type')
-    def validate_action_type(cls, v):
-        allowed_actions = [
-            'ffmpeg_remux', 'move', 'copy', 'index_asset', 'thumbs', 
-            'proxy', 'transcode_preset', 'tag', 'overlay_update'
-        ]
-        if v not in allowed_actions:
-            raise ValueError(f"Invalid action type. Must be one of: {allowed_actions}")
-        return v
 
 
 class RuleGuardrail(BaseModel):
     """Rule guardrail definition"""
-    guardrail_type: str = Field(..., description="Type of guardrail")
+    guardrail_type: GuardrailType = Field(..., description="Type of guardrail")
     threshold: Union[int, float] = Field(..., description="Threshold value")
-    
-    @validator('guardrail_type')
-    def validate_guardrail_type(cls, v):
-        allowed_guardrails = [
-            'pause_if_recording', 'pause_if_gpu_pct_above', 'pause_if_cpu_pct_above'
-        ]
-        if v not in allowed_guardrails:
-            raise ValueError(f"Invalid guardrail type. Must be one of: {allowed_guardrails}")
-        return v
 
 
 class RuleCreate(BaseModel):
@@ -107,8 +111,7 @@ class RuleResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra='ignore')
 
 
 class RuleListResponse(BaseModel):
@@ -147,10 +150,14 @@ class RuleExecutionHistory(BaseModel):
     total: int
     page: int
     per_page: int
+    
+    model_config = ConfigDict(defer_build=True)
 
 
 class RuleTestRequest(BaseModel):
     """Test rule request"""
     asset_id: Optional[str] = Field(None, description="Asset ID to test against")
     test_data: Optional[Dict[str, Any]] = Field(None, description="Mock data for testing")
-    dry_run: bool = Field(True, description="Whether to perform a dry run")
\ No newline at end of file
+    dry_run: bool = Field(True, description="Whether to perform a dry run")
+    
+    model_config = ConfigDict(defer_build=True)
\ No newline at end of file
@@ -1,27 +1,188 @@
 """Asset event sourcing service for tracking asset history."""
+import asyncio
 import hashlib
-import json
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional, List
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Any, Iterable, Optional, List, Tuple
+import orjson
 from ulid import ULID
 
 from app.api.db.database import get_db
 
 logger = logging.getLogger(__name__)
 
+# Events are coalesced into one transaction per batch
+BATCH_SIZE = 128
+BATCH_WINDOW = 0.005
+
+# Number of recently stored event ids remembered per process
+SEEN_MAX = 65536
+
+INSERT_EVENT_SQL = """
+    INSERT OR IGNORE INTO so_asset_events (id, asset_id, event_type, payload_json, job_id, created_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+TIMELINE_SQL = """
+    SELECT event_type, payload_json, job_id, created_at
+    FROM so_asset_events
+    WHERE asset_id = ?
+    ORDER BY created_at ASC, id ASC
+"""
+
+# Rows per query when streaming a timeline; no cursor stays open between pages
+TIMELINE_PAGE_SIZE = 500
+
+# Set SO_LEGACY_EVENT_IDS=true to keep generating the truncated SHA-256 ids
+# written by older releases, so re-emitted events still dedupe against them
+LEGACY_EVENT_IDS = os.getenv("SO_LEGACY_EVENT_IDS", "false").lower() == "true"
+
+
+@lru_cache(maxsize=4096)
+def _event_id(asset_id: str, event_type: str, job_id: Optional[str]) -> str:
+    """Hash the event identity; retries and re-indexing repeat the same inputs."""
+    components = [asset_id, event_type]
+    if job_id:
+        components.append(job_id)
+    hash_input = ":".join(components).encode()
+    if LEGACY_EVENT_IDS:
+        return hashlib.sha256(hash_input).hexdigest()[:16]
+    return hashlib.blake2b(hash_input, digest_size=8).hexdigest()
+
+
+def event_time_iso(created_at: Optional[int]) -> Optional[str]:
+    """UTC ISO string of an event's epoch millisecond created_at."""
+    # Rows inserted with an explicit NULL have no timestamp
+    if created_at is None:
+        return None
+    return datetime.fromtimestamp(created_at / 1000, tz=timezone.utc).isoformat()
+
+
+def _timeline_event(event_type: str, payload_json: str, job_id: Optional[str], created_at: Optional[int]) -> Dict[str, Any]:
+    """Shape a timeline row for the API."""
+    return {
+        "event_type": event_type,
+        "payload": orjson.loads(payload_json),
+        "job_id": job_id,
+        "created_at": event_time_iso(created_at)
+    }
+
 
 class AssetEventService:
     """Service for managing asset events (event sourcing)."""
     
+    _queue: Optional[asyncio.Queue] = None
+    _flusher: Optional[asyncio.Task] = None
+    # Recently stored event ids; duplicates return before touching the DB
+    _seen: "OrderedDict[str, None]" = OrderedDict()
+    
     @staticmethod
     def generate_event_id(asset_id: str, event_type: str, job_id: Optional[str] = None) -> str:
         """Generate deterministic event ID for idempotency."""
-        components = [asset_id, event_type]
-        if job_id:
-            components.append(job_id)
-        hash_input = ":".join(components)
-        return hashlib.sha256(hash_input.encode()).hexdigest()[:16]
+        return _event_id(asset_id, event_type, job_id)
+    
+    @classmethod
+    async def start(cls) -> None:
+        """Start the background flusher that batches event inserts."""
+        if cls._flusher is not None and not cls._flusher.done():
+            return
+        cls._queue = asyncio.Queue()
+        cls._flusher = asyncio.create_task(cls._flush_loop())
+    
+    @classmethod
+    async def stop(cls) -> None:
+        """Flush pending events and stop the background flusher."""
+        if cls._flusher is None:
+            return
+        flusher, cls._flusher = cls._flusher, None
+        # None tells the flusher to write what it has and exit
+        cls._queue.put_nowait(None)
+        await flusher
+    
+    @classmethod
+    async def _flush_loop(cls) -> None:
+        """Drain the queue in batches of up to BATCH_SIZE events."""
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await cls._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stopping = False
+            deadline = loop.time() + BATCH_WINDOW
+            while len(batch) < BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(cls._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await cls._write_batch(batch)
+            if stopping:
+                return
+    
+    @classmethod
+    async def _write_batch(cls, batch: List[Tuple[tuple, asyncio.Future]]) -> None:
+        """Insert a batch of events in one transaction and resolve their futures."""
+        ok = True
+        try:
+            db = await get_db()
+            # One timestamp per batch; events in a batch are at most BATCH_WINDOW apart
+            created_at = int(time.time() * 1000)
+            cursor = await db.executemany(INSERT_EVENT_SQL, [(*row, created_at) for row, _ in batch])
+            await db.commit()
+            skipped = len(batch) - cursor.rowcount
+            if skipped > 0:
+                logger.debug(f"{skipped} of {len(batch)} asset events already existed, skipped")
+            cls._mark_seen(row[0] for row, _ in batch)
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} asset events: {e}")
+            ok = False
+        
+        for _, future in batch:
+            if not future.done():
+                future.set_result(ok)
+    
+    @classmethod
+    def _mark_seen(cls, event_ids: Iterable[str]) -> None:
+        """Remember stored event ids, evicting the least recently seen."""
+        seen = cls._seen
+        for event_id in event_ids:
+            seen[event_id] = None
+            seen.move_to_end(event_id)
+        while len(seen) > SEEN_MAX:
+            seen.popitem(last=False)
+    
+    @classmethod
+    def _enqueue(cls, asset_id: str, event_type: str, payload: Dict[str, Any], job_id: Optional[str]) -> Optional[asyncio.Future]:
+        """Queue an event row for the flusher and return its completion future.
+        
+        Returns None without queueing when the event was already stored by
+        this process.
+        """
+        event_id = cls.generate_event_id(asset_id, event_type, job_id)
+        if event_id in cls._seen:
+            cls._seen.move_to_end(event_id)
+            return None
+        row = (
+            event_id,
+            asset_id,
+            event_type,
+            orjson.dumps(payload).decode(),
+            job_id
+        )
+        future = asyncio.get_running_loop().create_future()
+        cls._queue.put_nowait((row, future))
+        return future
     
     @classmethod
     async def emit_event(
@@ -33,68 +194,70 @@ class AssetEventService:
     ) -> bool:
         """Emit an asset event (idempotent)."""
         try:
-            db = await get_db()
-            event_id = cls.generate_event_id(asset_id, event_type, job_id)
-            
-            # Check if event already exists (idempotency)
-            cursor = await db.execute(
-                "SELECT id FROM so_asset_events WHERE id = ?",
-                (event_id,)
-            )
-            if await cursor.fetchone():
-                logger.debug(f"Event {event_id} already exists, skipping")
+            await cls.start()
+            future = cls._enqueue(asset_id, event_type, payload, job_id)
+            if future is None:
+                logger.debug(f"Event {event_type} for asset {asset_id} already emitted, skipping")
                 return True
-            
-            # Insert new event
-            await db.execute(
-                """
-                INSERT INTO so_asset_events (id, asset_id, event_type, payload_json, job_id, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    event_id,
-                    asset_id,
-                    event_type,
-                    json.dumps(payload),
-                    job_id,
-                    datetime.utcnow().isoformat()
-                )
-            )
-            await db.commit()
-            
-            logger.info(f"Emitted {event_type} event for asset {asset_id}")
-            return True
+            ok = await future
+            if ok:
+                logger.info(f"Emitted {event_type} event for asset {asset_id}")
+            return ok
             
         except Exception as e:
             logger.error(f"Failed to emit event: {e}")
             return False
     
     @classmethod
-    async def get_asset_timeline(cls, asset_id: str) -> List[Dict[str, Any]]:
-        """Get timeline of events for an asset."""
+    async def emit_events_bulk(cls, events: List[Dict[str, Any]]) -> bool:
+        """Emit several asset events at once.
+        
+        Each event is a dict with asset_id, event_type, payload and an
+        optional job_id.
+        """
         try:
-            db = await get_db()
+            await cls.start()
+            futures = [
+                cls._enqueue(e["asset_id"], e["event_type"], e["payload"], e.get("job_id"))
+                for e in events
+            ]
+            results = await asyncio.gather(*(f for f in futures if f is not None))
+            logger.info(f"Emitted {len(events)} asset events")
+            return all(results)
+            
+        except Exception as e:
+            logger.error(f"Failed to emit events: {e}")
+            return False
+    
+    @classmethod
+    async def iter_asset_timeline(cls, asset_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the events for an asset in time order, a page at a time.
+        
+        Each page is its own short query, so a slow consumer never holds a
+        cursor open on the shared connection. Errors are raised to the caller.
+        """
+        db = await get_db()
+        offset = 0
+        while True:
             cursor = await db.execute(
-                """
-                SELECT event_type, payload_json, job_id, created_at
-                FROM so_asset_events
-                WHERE asset_id = ?
-                ORDER BY created_at ASC
-                """,
-                (asset_id,)
+                TIMELINE_SQL + " LIMIT ? OFFSET ?",
+                (asset_id, TIMELINE_PAGE_SIZE, offset)
             )
-            
-            events = []
             rows = await cursor.fetchall()
             for row in rows:
-                events.append({
-                    "event_type": row[0],
-                    "payload": json.loads(row[1]),
-                    "job_id": row[2],
-                    "created_at": row[3]
-                })
-            
-            return events
+                yield _timeline_event(*row)
+            if len(rows) < TIMELINE_PAGE_SIZE:
+                return
+            offset += TIMELINE_PAGE_SIZE
+    
+    @classmethod
+    async def get_asset_timeline(cls, asset_id: str) -> List[Dict[str, Any]]:
+        """Get timeline of events for an asset."""
+        try:
+            db = await get_db()
+            cursor = await db.execute(TIMELINE_SQL, (asset_id,))
+            # One fetch and a comprehension avoid an await per row
+            return [_timeline_event(*row) for row in await cursor.fetchall()]
             
         except Exception as e:
             logger.error(f"Failed to get timeline for asset {asset_id}: {e}")
@@ -1,24 +1,47 @@
 import os
-import json
 import asyncio
+import hashlib
+import tempfile
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 import logging
+import orjson
 from pydantic import BaseModel
 from datetime import datetime
 
 try:
     from app.api.utils.encryption import (
         encrypt_sensitive_fields,
-        decrypt_sensitive_fields
+        decrypt_sensitive_fields,
+        has_plaintext_sensitive_fields
     )
 except ImportError:
     # Fallback if encryption not available
-    def encrypt_sensitive_fields(data): return data
+    def encrypt_sensitive_fields(data, path="", cache=None): return data
     def decrypt_sensitive_fields(data): return data
+    def has_plaintext_sensitive_fields(data, path=""): return False
 
 logger = logging.getLogger(__name__)
 
+
+def _parse_bool(value: str) -> bool:
+    return value.lower() == "true"
+
+
+# Set STREAMOPS_CONFIG_PRETTY to write an indented config file for hand editing
+CONFIG_PRETTY = bool(os.getenv("STREAMOPS_CONFIG_PRETTY"))
+_DUMP_OPTIONS = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if CONFIG_PRETTY else 0)
+
+# Environment variable -> (config attribute, converter)
+_ENV_OVERRIDES = (
+    ("OBS_WS_URL", "obs_ws_url", str),
+    ("OBS_WS_PASSWORD", "obs_ws_password", str),
+    ("GPU_GUARD_PCT", "gpu_guard_pct", int),
+    ("CPU_GUARD_PCT", "cpu_guard_pct", int),
+    ("PAUSE_WHEN_RECORDING", "pause_when_recording", _parse_bool),
+    ("ENABLE_REMOTE_WORKERS", "enable_remote_workers", _parse_bool),
+)
+
 class StreamOpsConfig(BaseModel):
     # General settings
     instance_name: str = "StreamOps"
@@ -70,25 +93,36 @@ class ConfigService:
         self.config_path = Path(os.getenv("CONFIG_PATH", "/data/config/config.json"))
         self.config: StreamOpsConfig = StreamOpsConfig()
         self._custom_config: Dict[str, Any] = {}  # Store custom configuration keys
-        self._lock = None
+        self._lock = asyncio.Lock()
+        # Hash of the plaintext config last written to (or read from) disk
+        self._saved_fingerprint: Optional[bytes] = None
+        # model_dump() of self.config, reset whenever a field is set
+        self._dump_cache: Optional[Dict[str, Any]] = None
+        # Field path -> (plaintext digest, ciphertext) of sensitive values
+        self._enc_cache: Dict[str, Tuple[bytes, str]] = {}
         
     async def load_config(self) -> StreamOpsConfig:
         """Load configuration from file and environment variables"""
-        if self._lock is None:
-            self._lock = asyncio.Lock()
         async with self._lock:
             # Load from file if exists
             if self.config_path.exists():
                 try:
-                    with open(self.config_path, 'r') as f:
-                        data = json.load(f)
-                        # Decrypt sensitive fields
-                        data = decrypt_sensitive_fields(data)
-                        # Extract custom config if present
-                        if 'custom' in data:
-                            self._custom_config = data.pop('custom')
-                        # Load standard config
-                        self.config = StreamOpsConfig(**{k: v for k, v in data.items() if k != 'custom'})
+                    raw = await asyncio.to_thread(self.config_path.read_bytes)
+                    data = orjson.loads(raw)
+                    # A file holding plaintext secrets (e.g. from an older
+                    # version) must be rewritten, so only then leave the
+                    # fingerprint unset
+                    needs_encryption = has_plaintext_sensitive_fields(data)
+                    # Decrypt sensitive fields
+                    data = decrypt_sensitive_fields(data)
+                    if not needs_encryption:
+                        self._saved_fingerprint = self._fingerprint(data)
+                    # Extract custom config if present
+                    if 'custom' in data:
+                        self._custom_config = data.pop('custom')
+                    # Load standard config
+                    self.config = StreamOpsConfig(**{k: v for k, v in data.items() if k != 'custom'})
+                    self._dump_cache = None
                     logger.info(f"Loaded config from {self.config_path}")
                 except Exception as e:
                     logger.error(f"Failed to load config: {e}")
@@ -101,71 +135,91 @@ class ConfigService:
             
             return self.config
     
+    def _config_dump(self) -> Dict[str, Any]:
+        """model_dump() of the standard config, cached until the next change"""
+        if self._dump_cache is None:
+            self._dump_cache = self.config.model_dump()
+        return self._dump_cache
+    
+    @staticmethod
+    def _fingerprint(all_config: Dict[str, Any]) -> bytes:
+        """Hash a plaintext config so unchanged saves can be skipped"""
+        payload = orjson.dumps(all_config, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        return hashlib.blake2b(payload, digest_size=16).digest()
+    
+    @staticmethod
+    def _write_file(path: Path, payload: bytes) -> None:
+        """Write the config through a private temp file (runs in a worker thread)"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temp name per save, so the API, worker and overlay processes
+        # never touch each other's temp files; mkstemp creates it 0600
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except FileNotFoundError:
+                pass
+            raise
+        # Persist the rename itself
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    
     async def _save_config_unlocked(self) -> None:
         """Save config without acquiring lock (internal use only)"""
         try:
-            self.config_path.parent.mkdir(parents=True, exist_ok=True)
             # Include both standard and custom config
             all_config = {
-                **self.config.model_dump(),
+                **self._config_dump(),
                 "custom": self._custom_config
             }
+            fingerprint = self._fingerprint(all_config)
+            if fingerprint == self._saved_fingerprint:
+                return
             # Encrypt sensitive fields before saving
-            encrypted_config = encrypt_sensitive_fields(all_config)
-            with open(self.config_path, 'w') as f:
-                json.dump(
-                    encrypted_config,
-                    f,
-                    indent=2,
-                    default=str
-                )
-            # Secure the config file
-            os.chmod(self.config_path, 0o600)
+            encrypted_config = encrypt_sensitive_fields(all_config, cache=self._enc_cache)
+            payload = orjson.dumps(encrypted_config, default=str, option=_DUMP_OPTIONS)
+            await asyncio.to_thread(self._write_file, self.config_path, payload)
+            self._saved_fingerprint = fingerprint
             logger.info(f"Saved encrypted config to {self.config_path}")
         except Exception as e:
             logger.error(f"Failed to save config: {e}")
     
     async def save_config(self) -> None:
         """Save current configuration to file"""
-        if self._lock is None:
-            self._lock = asyncio.Lock()
         async with self._lock:
             await self._save_config_unlocked()
     
     async def update_config(self, updates: Dict[str, Any]) -> StreamOpsConfig:
         """Update configuration with new values"""
-        if self._lock is None:
-            self._lock = asyncio.Lock()
         async with self._lock:
             for key, value in updates.items():
                 if hasattr(self.config, key):
                     setattr(self.config, key, value)
+            self._dump_cache = None
             
             await self._save_config_unlocked()
             return self.config
     
     def _apply_env_overrides(self):
         """Apply environment variable overrides to config"""
-        env_mapping = {
-            "OBS_WS_URL": "obs_ws_url",
-            "OBS_WS_PASSWORD": "obs_ws_password",
-            "GPU_GUARD_PCT": ("gpu_guard_pct", int),
-            "CPU_GUARD_PCT": ("cpu_guard_pct", int),
-            "PAUSE_WHEN_RECORDING": ("pause_when_recording", lambda x: x.lower() == "true"),
-            "ENABLE_REMOTE_WORKERS": ("enable_remote_workers", lambda x: x.lower() == "true"),
-        }
-        
-        for env_key, config_key in env_mapping.items():
-            env_value = os.getenv(env_key)
-            if env_value is not None:
-                if isinstance(config_key, tuple):
-                    attr_name, converter = config_key
-                    try:
-                        setattr(self.config, attr_name, converter(env_value))
-                    except Exception as e:
-                        logger.warning(f"Failed to convert env var {env_key}: {e}")
-                else:
-                    setattr(self.config, config_key, env_value)
+        self._dump_cache = None
+        for env_key, attr_name, converter in _ENV_OVERRIDES:
+            env_value = os.environ.get(env_key)
+            if env_value is None:
+                continue
+            try:
+                setattr(self.config, attr_name, converter(env_value))
+            except Exception as e:
+                logger.warning(f"Failed to convert env var {env_key}: {e}")
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value by key"""
@@ -173,35 +227,21 @@ class ConfigService:
     
     def get_all(self) -> Dict[str, Any]:
         """Get all configuration as dictionary"""
-        return self.config.model_dump()
+        return dict(self._config_dump())
     
     async def set_config(self, key: str, value: Any) -> None:
         """Set a custom configuration value"""
-        if self._lock is None:
-            self._lock = asyncio.Lock()
         async with self._lock:
             self._custom_config[key] = value
             # Save both standard and custom config
-            await self._save_all_config()
+            await self._save_config_unlocked()
+    
+    async def set_configs(self, values: Dict[str, Any]) -> None:
+        """Set several custom configuration values with a single save"""
+        async with self._lock:
+            self._custom_config.update(values)
+            await self._save_config_unlocked()
     
     async def get_config(self, key: str, default: Any = None) -> Any:
         """Get a custom configuration value"""
         return self._custom_config.get(key, default)
-    
-    async def _save_all_config(self) -> None:
-        """Save both standard and custom configuration"""
-        try:
-            self.config_path.parent.mkdir(parents=True, exist_ok=True)
-            all_config = {
-                **self.config.model_dump(),
-                "custom": self._custom_config
-            }
-            # Encrypt sensitive fields before saving
-            encrypted_config = encrypt_sensitive_fields(all_config)
-            with open(self.config_path, 'w') as f:
-                json.dump(encrypted_config, f, indent=2, default=str)
-            # Secure the config file  
-            os.chmod(self.config_path, 0o600)
-            logger.info(f"Saved encrypted config to {self.config_path}")
-        except Exception as e:
-            logger.error(f"Failed to save config: {e}")
\ No newline at end of file
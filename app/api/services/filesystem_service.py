@@ -3,11 +3,17 @@ Filesystem utility service for safe path operations.
 Consolidated from routers/drives.py and routers/filesystem.py
 """
 import os
-from typing import Optional
+import time
+from typing import Dict, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Seconds a check_directory_writable result is reused
+WRITABLE_CACHE_TTL = 30
+# Seconds between real write probes of a directory that os.access reports writable
+WRITE_PROBE_INTERVAL = 300
+
 
 class FilesystemService:
     """Service for filesystem operations with security checks"""
@@ -37,17 +43,28 @@ class FilesystemService:
         # Join and normalize the full path
         joined = os.path.abspath(os.path.join(base, relative))
         
-        # Ensure the joined path is within the base directory
-        if not joined.startswith(base):
+        # Ensure the joined path is within the base directory; comparing against
+        # base + separator keeps /mnt/drive_f from matching /mnt/drive_foo
+        prefix = base if base.endswith(os.sep) else base + os.sep
+        if joined != base and not joined.startswith(prefix):
             logger.warning(f"Path traversal attempt blocked: base={base}, relative={relative}")
             return None
             
         return joined
     
-    @staticmethod
-    def check_directory_writable(path: str) -> bool:
+    # path -> (checked_at, writable) for check_directory_writable
+    _writable_cache: Dict[str, Tuple[float, bool]] = {}
+    # path -> when a real write probe last ran
+    _write_probed_at: Dict[str, float] = {}
+    
+    @classmethod
+    def check_directory_writable(cls, path: str) -> bool:
         """
-        Check if a directory is writable by attempting to create a temporary file.
+        Check if a directory is writable.
+        
+        Results are cached for WRITABLE_CACHE_TTL seconds. os.access answers
+        most checks; a real file is only written every WRITE_PROBE_INTERVAL
+        seconds to catch read-only remounts and ACLs that access() misses.
         
         Args:
             path: Directory path to check
@@ -55,12 +72,25 @@ class FilesystemService:
         Returns:
             True if directory is writable, False otherwise
         """
-        if not os.path.exists(path):
-            return False
-            
         if not os.path.isdir(path):
             return False
-            
+        
+        now = time.monotonic()
+        cached = cls._writable_cache.get(path)
+        if cached and now - cached[0] < WRITABLE_CACHE_TTL:
+            return cached[1]
+        
+        writable = os.access(path, os.W_OK | os.X_OK)
+        if writable and now - cls._write_probed_at.get(path, float("-inf")) >= WRITE_PROBE_INTERVAL:
+            writable = cls._write_probe(path)
+            cls._write_probed_at[path] = now
+        
+        cls._writable_cache[path] = (now, writable)
+        return writable
+    
+    @staticmethod
+    def _write_probe(path: str) -> bool:
+        """Create and delete a temporary file to prove the directory is writable"""
         try:
             # Create a unique test file name
             test_file = os.path.join(path, f".streamops_write_test_{os.getpid()}")
@@ -115,13 +145,23 @@ class FilesystemService:
         """
         total_size = 0
         try:
-            for dirpath, dirnames, filenames in os.walk(path):
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-                    try:
-                        total_size += os.path.getsize(filepath)
-                    except (OSError, IOError):
-                        pass
+            # scandir entries carry the file type from the directory read, so
+            # only regular files need a stat; directory symlinks aren't followed
+            pending = [path]
+            while pending:
+                try:
+                    with os.scandir(pending.pop()) as it:
+                        for entry in it:
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    pending.append(entry.path)
+                                elif entry.is_file():
+                                    total_size += entry.stat().st_size
+                            except OSError:
+                                pass
+                except OSError:
+                    # Unreadable directories are skipped, as os.walk did
+                    pass
         except Exception as e:
             logger.error(f"Error calculating directory size for {path}: {e}")
         
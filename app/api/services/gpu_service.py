@@ -2,12 +2,52 @@
 
 import logging
 import asyncio
+import hashlib
+import json
 import os
-from typing import Optional, Dict, Any
+import re
+import shutil
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Detection results survive restarts while the hardware fingerprint is unchanged
+DISK_CACHE_MAX_AGE = 24 * 60 * 60
+# Files whose presence/mtime change when GPUs, drivers or FFmpeg change
+FINGERPRINT_PATHS = ("/proc/driver/nvidia/version", "/dev/nvidia0", "/dev/nvidiactl", "/dev/dri", "/dev/kfd")
+# Readings that go stale quickly and are not restored from disk
+VOLATILE_FIELDS = ("memory_free", "utilization", "temperature")
+# Seconds a utilization reading is reused before nvidia-smi is run again
+UTILIZATION_CACHE_TTL = float(os.getenv("GPU_UTIL_CACHE_TTL", "2"))
+# External tools the probes run; resolved on PATH once per service
+PROBE_TOOLS = ("nvidia-smi", "rocm-smi", "vainfo", "ffmpeg")
+# "CUDA Version: 12.2" in the nvidia-smi summary header
+CUDA_VERSION_RE = re.compile(rb"CUDA Version\s*:\s*([\d.]+)")
+
+# FFmpeg component names that indicate each hardware capability
+NVENC_ENCODERS = frozenset({b"h264_nvenc", b"hevc_nvenc"})
+CUVID_DECODERS = frozenset({b"h264_cuvid", b"hevc_cuvid"})
+CUDA_FILTERS = frozenset({b"scale_cuda", b"yadif_cuda"})
+AMD_ENCODERS = frozenset({b"h264_amf", b"h264_vaapi"})
+INTEL_ENCODERS = frozenset({b"h264_qsv", b"h264_vaapi"})
+
+
+def _component_names(listing: bytes) -> frozenset:
+    """Names from `ffmpeg -encoders/-decoders/-filters` output
+    
+    Each entry line is a flags column followed by the component name, so the
+    second token of every line is collected; header lines add harmless noise.
+    """
+    names = set()
+    for line in listing.splitlines():
+        fields = line.split(None, 2)
+        if len(fields) >= 2:
+            names.add(fields[1])
+    return frozenset(names)
+
 
 class GPUService:
     """Service for GPU detection and monitoring"""
@@ -17,6 +57,11 @@ class GPUService:
         self._last_check: Optional[datetime] = None
         self._cache_duration = timedelta(minutes=5)
         self._lock = asyncio.Lock()
+        self._disk_cache_path = Path(os.getenv("GPU_CACHE_PATH", "/data/config/gpu_info.json"))
+        # Absolute path of each probe tool, or None when it is not installed
+        self._bins: Dict[str, Optional[str]] = {tool: shutil.which(tool) for tool in PROBE_TOOLS}
+        # (monotonic time, utilization %) of the latest reading
+        self._util_cache: Optional[Tuple[float, int]] = None
     
     async def get_gpu_info(self, force_refresh: bool = False) -> Dict[str, Any]:
         """Get GPU information with caching"""
@@ -26,12 +71,73 @@ class GPUService:
                 if datetime.now() - self._last_check < self._cache_duration:
                     return self._gpu_info
             
+            fingerprint = await asyncio.to_thread(self._fingerprint)
+            
+            # Reuse a previous process's detection if nothing changed
+            if not force_refresh and self._gpu_info is None:
+                cached = await asyncio.to_thread(self._load_disk_cache, fingerprint)
+                if cached is not None:
+                    self._gpu_info = cached
+                    self._last_check = datetime.now()
+                    return self._gpu_info
+            
             # Detect GPU
+            if force_refresh:
+                # Pick up tools installed since startup
+                self._bins = {tool: shutil.which(tool) for tool in PROBE_TOOLS}
             self._gpu_info = await self._detect_gpu()
             self._last_check = datetime.now()
+            if self._gpu_info.get("utilization") is not None:
+                self._util_cache = (time.monotonic(), self._gpu_info["utilization"])
+            await asyncio.to_thread(self._save_disk_cache, fingerprint, self._gpu_info)
             
             return self._gpu_info
     
+    @staticmethod
+    def _fingerprint() -> str:
+        """Cheap hash of the device files, FFmpeg binary and CUDA env"""
+        parts = [os.environ.get("CUDA_VISIBLE_DEVICES", "")]
+        ffmpeg = shutil.which("ffmpeg")
+        for path in (*FINGERPRINT_PATHS, ffmpeg):
+            try:
+                st = os.stat(path) if path else None
+            except OSError:
+                st = None
+            parts.append(f"{path}:{st.st_mtime_ns}:{st.st_size}" if st else f"{path}:-")
+        return hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest()
+    
+    def _load_disk_cache(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Return persisted GPU info if it matches the fingerprint and is fresh"""
+        try:
+            with open(self._disk_cache_path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if cached.get("fingerprint") != fingerprint:
+            return None
+        if time.time() - cached.get("saved_at", 0) > DISK_CACHE_MAX_AGE:
+            return None
+        
+        info = cached.get("info")
+        if not isinstance(info, dict):
+            return None
+        for field in VOLATILE_FIELDS:
+            info[field] = None
+        logger.debug(f"Using cached GPU detection from {self._disk_cache_path}")
+        return info
+    
+    def _save_disk_cache(self, fingerprint: str, info: Dict[str, Any]) -> None:
+        """Persist GPU info atomically for the next process start"""
+        try:
+            self._disk_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._disk_cache_path.with_name(self._disk_cache_path.name + ".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({"fingerprint": fingerprint, "saved_at": time.time(), "info": info}, f)
+            os.replace(tmp_path, self._disk_cache_path)
+        except OSError as e:
+            logger.debug(f"Could not persist GPU detection cache: {e}")
+    
     async def _detect_gpu(self) -> Dict[str, Any]:
         """Detect GPU and capabilities (NVIDIA, AMD, Intel)"""
         info = {
@@ -51,16 +157,29 @@ class GPUService:
             "hw_filters_available": False
         }
         
+        encoders = frozenset()
         try:
-            # Check if nvidia-smi exists and works
-            result = await self._run_command([
-                "nvidia-smi",
-                "--query-gpu=name,driver_version,memory.total,memory.free,utilization.gpu,temperature.gpu",
-                "--format=csv,noheader,nounits"
-            ])
+            # Probe the driver and FFmpeg concurrently; the FFmpeg listings are
+            # shared by every vendor check below
+            gpu_result, cuda_result, encoders_result, decoders_result, filters_result = await asyncio.gather(
+                self._run_command([
+                    "nvidia-smi",
+                    "--query-gpu=name,driver_version,memory.total,memory.free,utilization.gpu,temperature.gpu",
+                    "--format=csv,noheader,nounits"
+                ]),
+                # The summary header carries the CUDA version; --query would
+                # dump hundreds of lines per GPU to find the same value
+                self._run_command(["nvidia-smi"]),
+                self._run_command(["ffmpeg", "-hide_banner", "-encoders"]),
+                self._run_command(["ffmpeg", "-hide_banner", "-decoders"]),
+                self._run_command(["ffmpeg", "-hide_banner", "-filters"])
+            )
+            encoders = _component_names(encoders_result[1]) if encoders_result[0] == 0 else frozenset()
+            decoders = _component_names(decoders_result[1]) if decoders_result[0] == 0 else frozenset()
+            filters = _component_names(filters_result[1]) if filters_result[0] == 0 else frozenset()
             
-            if result and result[0] == 0:
-                parts = result[1].strip().split(", ")
+            if gpu_result[0] == 0:
+                parts = gpu_result[1].decode().strip().split(", ")
                 if len(parts) >= 6:
                     info["available"] = True
                     info["name"] = parts[0]
@@ -72,54 +191,38 @@ class GPUService:
                     
                     logger.debug(f"GPU detected via nvidia-smi: {info['name']} (Driver: {info['driver_version']})")
             else:
-                logger.debug(f"nvidia-smi failed with code {result[0]}: {result[2]}")
-            
-            # Check CUDA version
-            if info["available"]:
-                cuda_result = await self._run_command(["nvidia-smi", "--query"])
-                if cuda_result and cuda_result[0] == 0:
-                    for line in cuda_result[1].split("\n"):
-                        if "CUDA Version" in line:
-                            cuda_version = line.split(":")[-1].strip()
-                            info["cuda_version"] = cuda_version
-                            break
+                logger.debug(f"nvidia-smi failed with code {gpu_result[0]}: {gpu_result[2].decode(errors='replace')}")
             
-            # Check FFmpeg capabilities
             if info["available"]:
-                # Detect vendor-specific encoders
+                # Check CUDA version
+                if cuda_result[0] == 0:
+                    match = CUDA_VERSION_RE.search(cuda_result[1])
+                    if match:
+                        info["cuda_version"] = match.group(1).decode()
+                
+                # Check FFmpeg capabilities
                 info["vendor"] = "nvidia"
-                encoders_result = await self._run_command(["ffmpeg", "-hide_banner", "-encoders"])
-                if encoders_result and encoders_result[0] == 0:
-                    encoders = encoders_result[1]
-                    if "h264_nvenc" in encoders or "hevc_nvenc" in encoders:
-                        info["hw_encode_available"] = True
-                        logger.debug("NVENC hardware encoding available")
+                if not NVENC_ENCODERS.isdisjoint(encoders):
+                    info["hw_encode_available"] = True
+                    logger.debug("NVENC hardware encoding available")
                 
-                # Check for hardware decoders
-                decoders_result = await self._run_command(["ffmpeg", "-hide_banner", "-decoders"])
-                if decoders_result and decoders_result[0] == 0:
-                    decoders = decoders_result[1]
-                    if "h264_cuvid" in decoders or "hevc_cuvid" in decoders:
-                        info["hw_decode_available"] = True
-                        logger.debug("NVDEC hardware decoding available")
+                if not CUVID_DECODERS.isdisjoint(decoders):
+                    info["hw_decode_available"] = True
+                    logger.debug("NVDEC hardware decoding available")
                 
-                # Check for hardware filters
-                filters_result = await self._run_command(["ffmpeg", "-hide_banner", "-filters"])
-                if filters_result and filters_result[0] == 0:
-                    filters = filters_result[1]
-                    if "scale_cuda" in filters or "yadif_cuda" in filters:
-                        info["hw_filters_available"] = True
-                        logger.debug("CUDA filters available")
+                if not CUDA_FILTERS.isdisjoint(filters):
+                    info["hw_filters_available"] = True
+                    logger.debug("CUDA filters available")
             else:
-                # Try AMD GPU detection
-                amd_result = await self._detect_amd_gpu()
+                # Try AMD and Intel detection together; AMD wins if both match
+                amd_result, intel_result = await asyncio.gather(
+                    self._detect_amd_gpu(encoders),
+                    self._detect_intel_gpu(encoders)
+                )
                 if amd_result["available"]:
                     info.update(amd_result)
-                else:
-                    # Try Intel GPU detection
-                    intel_result = await self._detect_intel_gpu()
-                    if intel_result["available"]:
-                        info.update(intel_result)
+                elif intel_result["available"]:
+                    info.update(intel_result)
         
         except Exception as e:
             logger.warning(f"GPU detection failed: {e}")
@@ -144,33 +247,48 @@ class GPUService:
                 
             # Check if FFmpeg has CUDA support
             if not info["available"]:
-                encoders_result = await self._run_command(["ffmpeg", "-hide_banner", "-encoders"])
-                if encoders_result and encoders_result[0] == 0:
-                    if "h264_nvenc" in encoders_result[1] or "hevc_nvenc" in encoders_result[1]:
-                        logger.info("NVENC detected in FFmpeg - GPU must be present")
-                        info["available"] = True
-                        info["vendor"] = "nvidia"
-                        info["name"] = "NVIDIA GPU (NVENC detected)"
-                        info["hw_encode_available"] = True
+                if not NVENC_ENCODERS.isdisjoint(encoders):
+                    logger.info("NVENC detected in FFmpeg - GPU must be present")
+                    info["available"] = True
+                    info["vendor"] = "nvidia"
+                    info["name"] = "NVIDIA GPU (NVENC detected)"
+                    info["hw_encode_available"] = True
         
         return info
     
     async def _run_command(self, cmd: list) -> tuple:
-        """Run command and return result"""
+        """Run command and return (returncode, stdout, stderr)
+        
+        Output is left as bytes; callers decode only what they parse as text.
+        Tools found missing at startup fail immediately without a fork/exec.
+        """
+        tool = cmd[0]
+        binary = self._bins[tool] if tool in self._bins else shutil.which(tool)
+        if binary is None:
+            return -1, b"", f"{tool} not found".encode()
         try:
             process = await asyncio.create_subprocess_exec(
-                *cmd,
+                binary,
+                *cmd[1:],
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
             stdout, stderr = await process.communicate()
-            return process.returncode, stdout.decode(), stderr.decode()
+            return process.returncode, stdout, stderr
         except Exception as e:
             logger.debug(f"Command failed: {cmd} - {e}")
-            return -1, "", str(e)
+            return -1, b"", str(e).encode()
     
-    async def check_gpu_utilization(self) -> Optional[int]:
-        """Get current GPU utilization percentage"""
+    async def check_gpu_utilization(self, force_refresh: bool = False) -> Optional[int]:
+        """Get current GPU utilization percentage
+        
+        A reading younger than UTILIZATION_CACHE_TTL, including the one taken
+        by get_gpu_info, is returned without spawning nvidia-smi.
+        """
+        cached = self._util_cache
+        if not force_refresh and cached and time.monotonic() - cached[0] < UTILIZATION_CACHE_TTL:
+            return cached[1]
+        
         try:
             result = await self._run_command([
                 "nvidia-smi",
@@ -179,7 +297,9 @@ class GPUService:
             ])
             
             if result[0] == 0:
-                return int(result[1].strip())
+                utilization = int(result[1].strip())
+                self._util_cache = (time.monotonic(), utilization)
+                return utilization
         except Exception as e:
             logger.debug(f"Failed to get GPU utilization: {e}")
         
@@ -193,8 +313,8 @@ class GPUService:
         
         return utilization < threshold
     
-    async def _detect_amd_gpu(self) -> Dict[str, Any]:
-        """Detect AMD GPU"""
+    async def _detect_amd_gpu(self, encoders: frozenset) -> Dict[str, Any]:
+        """Detect AMD GPU given the FFmpeg encoder names"""
         info = {"available": False, "vendor": "amd"}
         
         try:
@@ -206,34 +326,30 @@ class GPUService:
                 logger.info("AMD GPU detected")
                 
                 # Check for AMF/VCE encoders in FFmpeg
-                encoders_result = await self._run_command(["ffmpeg", "-hide_banner", "-encoders"])
-                if encoders_result[0] == 0:
-                    if "h264_amf" in encoders_result[1] or "h264_vaapi" in encoders_result[1]:
-                        info["hw_encode_available"] = True
-                        logger.info("AMD hardware encoding available")
+                if not AMD_ENCODERS.isdisjoint(encoders):
+                    info["hw_encode_available"] = True
+                    logger.info("AMD hardware encoding available")
         except:
             pass
         
         return info
     
-    async def _detect_intel_gpu(self) -> Dict[str, Any]:
-        """Detect Intel GPU"""
+    async def _detect_intel_gpu(self, encoders: frozenset) -> Dict[str, Any]:
+        """Detect Intel GPU given the FFmpeg encoder names"""
         info = {"available": False, "vendor": "intel"}
         
         try:
             # Check for Intel GPU via vainfo
             result = await self._run_command(["vainfo"])
-            if result[0] == 0 and "Intel" in result[1]:
+            if result[0] == 0 and b"Intel" in result[1]:
                 info["available"] = True
                 info["name"] = "Intel GPU"
                 logger.info("Intel GPU detected")
                 
                 # Check for QSV encoders in FFmpeg
-                encoders_result = await self._run_command(["ffmpeg", "-hide_banner", "-encoders"])
-                if encoders_result[0] == 0:
-                    if "h264_qsv" in encoders_result[1] or "h264_vaapi" in encoders_result[1]:
-                        info["hw_encode_available"] = True
-                        logger.info("Intel Quick Sync hardware encoding available")
+                if not INTEL_ENCODERS.isdisjoint(encoders):
+                    info["hw_encode_available"] = True
+                    logger.info("Intel Quick Sync hardware encoding available")
         except:
             pass
         
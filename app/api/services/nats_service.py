@@ -1,23 +1,157 @@
 import os
-import json
 import asyncio
 import logging
+import random
+import time
 from typing import Any, Dict, Optional, Callable
-from datetime import datetime
+from datetime import datetime, timezone
+import msgpack
 import nats
+import orjson
+import zstandard
 from nats.errors import ConnectionClosedError, TimeoutError as NatsTimeoutError
 from nats.js import JetStreamContext
+from nats.js.errors import NotFoundError
 from nats.js.api import StreamConfig, ConsumerConfig
 
 logger = logging.getLogger(__name__)
 
+# Stream that holds jobs.> messages
+JOBS_STREAM = "JOBS"
+
+# An idle consumer long-polls for one message so the server holds the pull
+# open; heartbeats show the request is still alive
+IDLE_FETCH_TIMEOUT = 30.0
+IDLE_FETCH_HEARTBEAT = 5.0
+
+# Bounds of the decorrelated-jitter backoff after a consume error
+CONSUME_BACKOFF_BASE = 0.1
+CONSUME_BACKOFF_MAX = 30.0
+
+# Job payloads larger than this are zstd-compressed and flagged with a
+# Content-Encoding header
+ZSTD_MIN_SIZE = 4096
+ZSTD_LEVEL = 3
+# Shared by event loop encodes only; zstd contexts are not thread-safe
+_zstd_compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+
+# Jobs bigger than this are encoded/decoded in a worker thread so the event
+# loop keeps serving other sockets, including the NATS ping/pong
+OFFLOAD_SIZE = 256 * 1024
+
+# Longest flush() waits for the acks of pipelined job publishes
+FLUSH_ACK_TIMEOUT = 10.0
+
+# Leading byte of MessagePack messages. 0xc1 is never used by MessagePack and
+# cannot start a JSON document, so older JSON messages are still recognised.
+MSGPACK_MAGIC = b"\xc1"
+
+
+def _msgpack_default(value: Any) -> Any:
+    """Send datetimes as ISO strings, matching what consumers got from JSON"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+# Only used from the event loop thread, so one packer can be shared
+_packer = msgpack.Packer(default=_msgpack_default)
+_pack = _packer.pack
+
+# Envelope kind -> (subject root, field count, field holding the subject name)
+_ENVELOPES = {
+    "job": ("jobs", 4, "type"),
+    "event": ("events", 3, "type"),
+    "metric": ("metrics", 4, "name"),
+}
+_ENVELOPE_CACHE_MAX = 1024
+
+# Pre-packed keys of the per-message envelope fields
+_KEY_ID = _pack("id")
+_KEY_DATA = _pack("data")
+_KEY_VALUE = _pack("value")
+_KEY_TAGS = _pack("tags")
+_KEY_CREATED_AT = _pack("created_at")
+_KEY_TIMESTAMP = _pack("timestamp")
+
+
+def _decode_message(data: bytes) -> Any:
+    """Decode a message, accepting both MessagePack and legacy JSON"""
+    if data[:1] == MSGPACK_MAGIC:
+        return msgpack.unpackb(memoryview(data)[1:], strict_map_key=False)
+    return orjson.loads(data)
+
+
+def decode_job(msg) -> Dict[str, Any]:
+    """Decode the body of a job message, once per message object
+    
+    The result is kept on the message, so several handlers given the same
+    raw message from subscribe_jobs(parse=False) share one decode. Safe to
+    call from a worker thread.
+    """
+    parsed = msg.__dict__.get("_parsed")
+    if parsed is None:
+        data = msg.data
+        if msg.headers and msg.headers.get("Content-Encoding") == "zstd":
+            data = zstandard.ZstdDecompressor().decompress(data)
+        parsed = _decode_message(data)
+        msg._parsed = parsed
+    return parsed
+
+
+def _estimated_size(job_data: Dict[str, Any]) -> int:
+    """Rough encoded size of a job from its top-level values, without encoding"""
+    size = 0
+    for value in job_data.values():
+        if isinstance(value, (str, bytes)):
+            size += len(value)
+        elif isinstance(value, (list, tuple, dict)):
+            size += 64 * len(value)
+        else:
+            size += 16
+    return size
+
+
+def _encode_large_job(job_type: str, job_data: Dict[str, Any]) -> bytes:
+    """Encode and compress a job in a worker thread, using no shared state"""
+    payload = MSGPACK_MAGIC + msgpack.packb({
+        "type": job_type,
+        "id": job_data.get("id"),
+        "data": job_data,
+        "created_at": datetime.now(timezone.utc),
+    }, default=_msgpack_default)
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+
 class NATSService:
     def __init__(self):
         self.url = os.getenv("NATS_URL", "nats://localhost:4222")
         self.nc: Optional[nats.NATS] = None
         self.js: Optional[JetStreamContext] = None
-        self._subscriptions = []
+        # Running _consume_messages loops, cancelled on disconnect
+        self._fetch_tasks: set = set()
+        # (stream, durable name) -> pull subscription bound to that consumer
+        self._sub_cache: Dict[tuple, Any] = {}
         self._connected = False
+        # (envelope kind, name) -> (subject, packed map header and name field)
+        self._envelope_cache: Dict[tuple, bytes] = {}
+        # Packed ISO timestamp and the millisecond it was made for
+        self._ts_ms = -1
+        self._ts_packed = b""
+        # Jobs are long-running and acked only when done, so a fetch must not
+        # pull more than can finish inside ack_wait; raise for short job types.
+        # The timeout bounds how long a busy batch fetch waits to fill up.
+        self.fetch_batch = int(os.getenv("NATS_FETCH_BATCH", "10"))
+        self.fetch_timeout = float(os.getenv("NATS_FETCH_TIMEOUT", "1"))
+        # Handler workers shared by all subscriptions; fetch loops feed them
+        # (handler, msg, done) items through a queue no longer than the pool
+        self._worker_count = int(os.getenv("NATS_HANDLER_CONCURRENCY", "32"))
+        self._work_q: asyncio.Queue = asyncio.Queue(maxsize=self._worker_count)
+        self._workers: list = []
+        # (job id, ack future) of publish_job_async calls not yet collected,
+        # and ids of jobs that failed in collections made before flush()
+        self._pending: list = []
+        self._pending_cap = 256
+        self._unconfirmed: list = []
         
     async def connect(self) -> None:
         """Connect to NATS server and initialize JetStream"""
@@ -47,7 +181,21 @@ class NATSService:
     
     async def disconnect(self) -> None:
         """Disconnect from NATS"""
+        # Stop fetching before the connection goes away, then the workers
+        tasks = list(self._fetch_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        
+        self._sub_cache.clear()
+        
         if self.nc and not self.nc.is_closed:
+            await self.flush()
             await self.nc.drain()
             await self.nc.close()
             self._connected = False
@@ -57,7 +205,7 @@ class NATSService:
         """Create JetStream streams for different job types"""
         streams = [
             {
-                "name": "JOBS",
+                "name": JOBS_STREAM,
                 "subjects": ["jobs.>"],
                 "max_age": 86400 * 7,  # 7 days
                 "max_msgs": 100000,
@@ -85,46 +233,162 @@ class NATSService:
             },
         ]
         
-        for stream_config in streams:
+        await asyncio.gather(*[
+            self._ensure_stream(StreamConfig(**stream_config))
+            for stream_config in streams
+        ])
+    
+    async def _ensure_stream(self, config: StreamConfig) -> None:
+        """Create a stream, or bring an existing one in line with config"""
+        try:
             try:
-                config = StreamConfig(**stream_config)
+                await self.js.stream_info(config.name)
+            except NotFoundError:
                 await self.js.add_stream(config)
-                logger.info(f"Created/updated stream: {stream_config['name']}")
-            except Exception as e:
-                if "stream name already in use" not in str(e):
-                    logger.error(f"Failed to create stream {stream_config['name']}: {e}")
+                logger.info(f"Created stream: {config.name}")
+            else:
+                await self.js.update_stream(config)
+                logger.info(f"Updated stream: {config.name}")
+        except Exception as e:
+            logger.error(f"Failed to create/update stream {config.name}: {e}")
     
     async def publish_job(self, job_type: str, job_data: Dict[str, Any]) -> str:
         """Publish a job to the queue"""
         if not self._connected:
             raise ConnectionError("Not connected to NATS")
         
-        subject = f"jobs.{job_type}"
-        message = {
-            "id": job_data.get("id"),
-            "type": job_type,
-            "data": job_data,
-            "created_at": datetime.utcnow().isoformat(),
-        }
-        
         try:
-            ack = await self.js.publish(
-                subject,
-                json.dumps(message).encode(),
-            )
-            logger.info(f"Published job {job_data.get('id')} to {subject}")
+            subject, payload, headers = await self._job_message(job_type, job_data)
+            ack = await self.js.publish(subject, payload, headers=headers)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Published job {job_data.get('id')} to {subject}")
             return ack.seq
         except Exception as e:
             logger.error(f"Failed to publish job: {e}")
             raise
     
+    async def publish_job_async(self, job_type: str, job_data: Dict[str, Any]) -> None:
+        """Publish a job without waiting for its ack
+        
+        Use for bursts of jobs and call flush() afterwards, which reports the
+        jobs that were not confirmed. Acks are collected every _pending_cap
+        publishes to bound the number in flight.
+        """
+        if not self._connected:
+            raise ConnectionError("Not connected to NATS")
+        
+        job_id = job_data.get("id")
+        subject, payload, headers = await self._job_message(job_type, job_data)
+        future = await self.js.publish_async(subject, payload, headers=headers)
+        self._pending.append((job_id, future))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Sent job {job_id} to {subject} (ack pending)")
+        
+        if len(self._pending) >= self._pending_cap:
+            self._unconfirmed.extend(await self._collect_acks())
+    
+    async def flush(self) -> list:
+        """Wait for the acks of pending async job publishes
+        
+        Returns the ids of the jobs whose publish the server rejected or did
+        not ack within FLUSH_ACK_TIMEOUT, since the last flush.
+        """
+        failed = self._unconfirmed + await self._collect_acks()
+        self._unconfirmed = []
+        return failed
+    
+    async def _collect_acks(self) -> list:
+        """Wait for the pending acks and return the ids of failed jobs"""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return []
+        # A lost ack must not hang the caller, or shutdown through disconnect()
+        await asyncio.wait([future for _, future in pending], timeout=FLUSH_ACK_TIMEOUT)
+        failed = []
+        for job_id, future in pending:
+            if not future.done():
+                future.cancel()
+                logger.error(f"Failed to publish job {job_id}: no ack within {FLUSH_ACK_TIMEOUT}s")
+            elif future.cancelled():
+                logger.error(f"Failed to publish job {job_id}: publish cancelled")
+            elif future.exception() is not None:
+                logger.error(f"Failed to publish job {job_id}: {future.exception()}")
+            else:
+                continue
+            failed.append(job_id)
+        return failed
+    
+    def _envelope(self, kind: str, name: str) -> tuple:
+        """Subject and packed start of a message for a kind and name
+        
+        The packed prefix is the map header plus the constant name field. The
+        remaining fields are packed per message and appended, which gives the
+        same bytes as packing the whole dict.
+        """
+        key = (kind, name)
+        envelope = self._envelope_cache.get(key)
+        if envelope is None:
+            root, size, name_field = _ENVELOPES[kind]
+            prefix = MSGPACK_MAGIC + _packer.pack_map_header(size) + _pack(name_field) + _pack(name)
+            envelope = (f"{root}.{name}", prefix)
+            if len(self._envelope_cache) >= _ENVELOPE_CACHE_MAX:
+                self._envelope_cache.clear()
+            self._envelope_cache[key] = envelope
+        return envelope
+    
+    async def _job_message(self, job_type: str, job_data: Dict[str, Any]) -> tuple:
+        """Subject, payload and headers for a job publish
+        
+        The headers let consumers route a job without decoding it, and mark
+        payloads that were compressed for being large.
+        """
+        subject, prefix = self._envelope("job", job_type)
+        headers = {"X-Job-Type": job_type}
+        job_id = job_data.get("id")
+        if job_id is not None:
+            headers["X-Job-Id"] = str(job_id)
+        
+        if _estimated_size(job_data) > OFFLOAD_SIZE:
+            payload = await asyncio.to_thread(_encode_large_job, job_type, job_data)
+            headers["Content-Encoding"] = "zstd"
+            return subject, payload, headers
+        
+        payload = b"".join((
+            prefix,
+            _KEY_ID, _pack(job_id),
+            _KEY_DATA, _pack(job_data),
+            _KEY_CREATED_AT, self._timestamp(),
+        ))
+        if len(payload) > ZSTD_MIN_SIZE:
+            payload = _zstd_compressor.compress(payload)
+            headers["Content-Encoding"] = "zstd"
+        return subject, payload, headers
+    
+    def _timestamp(self) -> bytes:
+        """Packed UTC ISO timestamp, rebuilt at most once per millisecond"""
+        ms = time.time_ns() // 1_000_000
+        if ms != self._ts_ms:
+            stamp = datetime.fromtimestamp(ms / 1000, timezone.utc).isoformat(timespec="milliseconds")
+            self._ts_packed = _pack(stamp)
+            self._ts_ms = ms
+        return self._ts_packed
+    
     async def subscribe_jobs(
         self,
         job_type: str,
         handler: Callable,
-        queue_group: str = "workers"
+        queue_group: str = "workers",
+        fetch_batch: Optional[int] = None,
+        fetch_timeout: Optional[float] = None,
+        parse: bool = True
     ) -> None:
-        """Subscribe to jobs of a specific type"""
+        """Subscribe to jobs of a specific type
+        
+        fetch_batch and fetch_timeout override the service defaults for this
+        subject. With parse=False the handler gets the raw NATS message; the
+        job id and type are in its X-Job-Id/X-Job-Type headers, and
+        decode_job(msg) parses the body when it is needed.
+        """
         if not self._connected:
             raise ConnectionError("Not connected to NATS")
         
@@ -132,68 +396,139 @@ class NATSService:
         
         async def message_handler(msg):
             try:
-                data = json.loads(msg.data.decode())
-                await handler(data)
+                if not parse:
+                    await handler(msg)
+                elif len(msg.data) > OFFLOAD_SIZE:
+                    await handler(await asyncio.to_thread(decode_job, msg))
+                else:
+                    await handler(decode_job(msg))
                 await msg.ack()
             except Exception as e:
                 logger.error(f"Error processing job: {e}")
                 await msg.nak()
         
-        # Create durable consumer
-        consumer_config = ConsumerConfig(
-            durable_name=f"{job_type}_consumer",
-            filter_subject=subject,
-            ack_policy="explicit",
-            max_deliver=3,
-            ack_wait=300,  # 5 minutes
-        )
+        durable = f"{job_type}_consumer"
         
         try:
-            sub = await self.js.pull_subscribe(
-                subject,
-                durable=consumer_config.durable_name,
-                config=consumer_config,
-            )
-            self._subscriptions.append(sub)
+            sub = self._sub_cache.get((JOBS_STREAM, durable))
+            if sub is None:
+                # Naming the stream skips the lookup by subject; the consumer
+                # is only created if consumer_info reports it missing
+                consumer_config = ConsumerConfig(
+                    durable_name=durable,
+                    filter_subject=subject,
+                    ack_policy="explicit",
+                    max_deliver=3,
+                    ack_wait=300,  # 5 minutes
+                )
+                sub = await self.js.pull_subscribe(
+                    subject,
+                    durable=durable,
+                    stream=JOBS_STREAM,
+                    config=consumer_config,
+                )
+                self._sub_cache[(JOBS_STREAM, durable)] = sub
             
             # Start consuming messages
-            asyncio.create_task(self._consume_messages(sub, message_handler))
+            self._start_workers()
+            task = asyncio.create_task(self._consume_messages(
+                sub,
+                message_handler,
+                fetch_batch or self.fetch_batch,
+                fetch_timeout or self.fetch_timeout
+            ))
+            self._fetch_tasks.add(task)
+            task.add_done_callback(self._fetch_tasks.discard)
             
             logger.info(f"Subscribed to {subject}")
         except Exception as e:
             logger.error(f"Failed to subscribe to {subject}: {e}")
             raise
     
-    async def _consume_messages(self, subscription, handler):
-        """Continuously consume messages from subscription"""
+    def _start_workers(self) -> None:
+        """Start the shared handler workers if they are not running"""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._handler_worker())
+            for _ in range(self._worker_count)
+        ]
+    
+    async def _handler_worker(self) -> None:
+        """Run handlers for messages queued by the fetch loops"""
+        while True:
+            handler, msg, done = await self._work_q.get()
+            try:
+                await handler(msg)
+            except Exception as e:
+                logger.error(f"Error handling message: {e}")
+            finally:
+                if not done.done():
+                    done.set_result(None)
+                self._work_q.task_done()
+    
+    async def _consume_messages(self, subscription, handler, batch: int, timeout: float):
+        """Continuously consume messages from subscription
+        
+        Messages are handed to the shared workers, and the next fetch waits
+        until the whole batch is handled so unacked jobs do not pile up.
+        
+        Once the queue runs dry the loop switches to a single-message long
+        poll, which returns as soon as a job arrives. A batch fetch that finds
+        nothing waiting holds out for a full batch until its timeout, so it is
+        only used while the last fetch came back full.
+        """
+        loop = asyncio.get_running_loop()
+        backoff = CONSUME_BACKOFF_BASE
+        idle = False
         while self._connected:
             try:
-                messages = await subscription.fetch(batch=10, timeout=1)
+                if idle:
+                    messages = await subscription.fetch(
+                        batch=1,
+                        timeout=IDLE_FETCH_TIMEOUT,
+                        heartbeat=IDLE_FETCH_HEARTBEAT
+                    )
+                else:
+                    messages = await subscription.fetch(batch=batch, timeout=timeout)
+                backoff = CONSUME_BACKOFF_BASE
+                # A job arriving on the idle poll means work is back, so the
+                # next fetch is a full batch; only a short batch goes idle
+                idle = not messages if idle else len(messages) < batch
+                pending = []
                 for msg in messages:
-                    await handler(msg)
+                    done = loop.create_future()
+                    await self._work_q.put((handler, msg, done))
+                    pending.append(done)
+                await asyncio.gather(*pending)
             except NatsTimeoutError:
                 # Timeout is normal when no messages
+                idle = True
                 continue
             except Exception as e:
-                logger.error(f"Error consuming messages: {e}")
-                await asyncio.sleep(1)
+                # Jittered so consumers across replicas don't retry in lockstep
+                backoff = min(CONSUME_BACKOFF_MAX, random.uniform(CONSUME_BACKOFF_BASE, backoff * 3))
+                logger.error(f"Error consuming messages: {e} (retrying in {backoff:.1f}s)")
+                await asyncio.sleep(backoff)
     
     async def publish_event(self, event_type: str, event_data: Dict[str, Any]) -> None:
         """Publish an event"""
         if not self._connected:
             return
         
-        subject = f"events.{event_type}"
-        message = {
-            "type": event_type,
-            "data": event_data,
-            "timestamp": datetime.utcnow().isoformat(),
-        }
+        subject, prefix = self._envelope("event", event_type)
+        payload = b"".join((
+            prefix,
+            _KEY_DATA, _pack(event_data),
+            _KEY_TIMESTAMP, self._timestamp(),
+        ))
         
         try:
+            # Core NATS publish only appends to the client's write buffer; its
+            # background flusher batches socket writes, so no flush is needed
             await self.nc.publish(
                 subject,
-                json.dumps(message).encode(),
+                payload,
             )
         except Exception as e:
             logger.error(f"Failed to publish event: {e}")
@@ -203,18 +538,18 @@ class NATSService:
         if not self._connected:
             return
         
-        subject = f"metrics.{metric_name}"
-        message = {
-            "name": metric_name,
-            "value": value,
-            "tags": tags or {},
-            "timestamp": datetime.utcnow().isoformat(),
-        }
+        subject, prefix = self._envelope("metric", metric_name)
+        payload = b"".join((
+            prefix,
+            _KEY_VALUE, _pack(value),
+            _KEY_TAGS, _pack(tags or {}),
+            _KEY_TIMESTAMP, self._timestamp(),
+        ))
         
         try:
             await self.nc.publish(
                 subject,
-                json.dumps(message).encode(),
+                payload,
             )
         except Exception as e:
             logger.error(f"Failed to publish metric: {e}")
@@ -3,15 +3,78 @@ import os
 import json
 import logging
 import asyncio
-from typing import Dict, Any, Optional, List
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Set, Tuple
 from datetime import datetime, timedelta
+from urllib.parse import urlparse
 import obsws_python as obs
+from obsws_python.error import OBSSDKRequestError
+from obsws_python.util import as_dataclass
 from ulid import ULID
 
 from app.api.db.database import get_db
+from app.api.routers.events import notify_recording_state
 
 logger = logging.getLogger(__name__)
 
+# Status poll interval when OBS events are not available
+POLL_INTERVAL = 5
+# With events flowing, polling is only a liveness check
+EVENT_POLL_INTERVAL = 60
+EVENT_POLL_JITTER = 5
+# Skip the liveness refresh if an event arrived this recently
+EVENT_FRESH_SECONDS = 30
+# Persist last_seen at least this often while nothing else changes
+HEARTBEAT_INTERVAL = 60
+
+
+def parse_ws_url(ws_url: str) -> Optional[Tuple[str, int]]:
+    """Split a ws:// or wss:// URL into host and port, or None if invalid"""
+    try:
+        parsed = urlparse(ws_url)
+        host, port = parsed.hostname, parsed.port
+    except ValueError:
+        return None
+    if parsed.scheme not in ("ws", "wss") or not host or not port:
+        return None
+    # obsws-python formats the URL itself, so IPv6 hosts need their brackets back
+    if ":" in host:
+        host = f"[{host}]"
+    return host, port
+
+
+def request_batch(client: obs.ReqClient, *request_types: str) -> List[Any]:
+    """Send parameterless requests as one RequestBatch and return their responses
+    
+    One round trip instead of one per request. Must run on the client's own
+    thread, since the underlying socket is not safe to share.
+    """
+    ws = client.base_client.ws
+    ws.send(json.dumps({
+        "op": 8,
+        "d": {
+            "requestId": str(ULID()),
+            "haltOnFailure": True,
+            "requests": [
+                {"requestType": request_type, "requestId": str(i)}
+                for i, request_type in enumerate(request_types)
+            ]
+        }
+    }))
+    response = json.loads(ws.recv())
+    
+    results: List[Any] = [None] * len(request_types)
+    for result in response["d"]["results"]:
+        status = result["requestStatus"]
+        if not status["result"]:
+            raise OBSSDKRequestError(result["requestType"], status["code"], status.get("comment"))
+        results[int(result["requestId"])] = as_dataclass(result["requestType"], result.get("responseData", {}))
+    if None in results:
+        raise OBSSDKRequestError("RequestBatch", 0, "incomplete batch response")
+    return results
+
 class OBSClient:
     """Single OBS WebSocket client instance"""
     
@@ -25,27 +88,45 @@ class OBSClient:
         self.connected = False
         self.last_error: Optional[str] = None
         self.last_seen: Optional[datetime] = None
+        # ISO form of last_seen, formatted once per update
+        self.last_seen_iso: Optional[str] = None
         self.recording = False
         self.streaming = False
         self.current_scene: Optional[str] = None
+        # obsws calls block; each client gets its own thread so one slow OBS
+        # cannot hold up the others. A single worker also keeps requests on
+        # the ReqClient socket from interleaving.
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Set once OBS event callbacks are registered on event_client
+        self.events_active = False
+        self.last_event_ts = 0.0
+        # get_status() result and the field values it was built from
+        self._status_key: Optional[tuple] = None
+        self._status_cache: Optional[Dict[str, Any]] = None
+    
+    def touch(self):
+        """Record that OBS was heard from just now"""
+        self.last_seen = datetime.utcnow()
+        self.last_seen_iso = self.last_seen.isoformat()
+    
+    async def _run(self, fn, *args):
+        """Run a blocking obsws call on this client's thread"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"obs-{self.connection_id}")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
         
     async def connect(self) -> bool:
         """Connect to OBS WebSocket"""
         try:
-            # Parse URL to get host and port
-            import re
-            match = re.match(r'wss?://([^:]+):(\d+)', self.ws_url)
-            if not match:
+            address = parse_ws_url(self.ws_url)
+            if not address:
                 self.last_error = f"Invalid WebSocket URL: {self.ws_url}"
                 logger.error(f"[{self.name}] {self.last_error}")
                 return False
             
-            host = match.group(1)
-            port = int(match.group(2))
-            
-            # Run blocking connection in executor
-            loop = asyncio.get_event_loop()
+            host, port = address
             
+            # Run blocking connection on the client's thread
             def _connect_sync():
                 # Connect request client
                 self.client = obs.ReqClient(
@@ -63,19 +144,17 @@ class OBSClient:
                 )
                 
                 # Get initial status
-                status = self.client.get_record_status()
-                self.recording = status.output_active
-                
-                stream_status = self.client.get_stream_status()
+                record_status, stream_status, scene = request_batch(
+                    self.client, "GetRecordStatus", "GetStreamStatus", "GetCurrentProgramScene"
+                )
+                self.recording = record_status.output_active
                 self.streaming = stream_status.output_active
-                
-                scene = self.client.get_current_program_scene()
                 self.current_scene = scene.scene_name
             
-            await loop.run_in_executor(None, _connect_sync)
+            await self._run(_connect_sync)
             
             self.connected = True
-            self.last_seen = datetime.utcnow()
+            self.touch()
             self.last_error = None
             logger.info(f"[{self.name}] Connected to OBS at {self.ws_url}")
             return True
@@ -90,13 +169,12 @@ class OBSClient:
         """Disconnect from OBS"""
         try:
             if self.event_client:
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(None, self.event_client.disconnect)
+                await self._run(self.event_client.disconnect)
                 self.event_client = None
+                self.events_active = False
             
             if self.client:
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(None, self.client.disconnect)
+                await self._run(self.client.disconnect)
                 self.client = None
             
             self.connected = False
@@ -104,14 +182,17 @@ class OBSClient:
             
         except Exception as e:
             logger.error(f"[{self.name}] Error during disconnect: {e}")
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
     
     async def start_recording(self):
         """Start recording in OBS"""
         if not self.client:
             raise Exception("Not connected to OBS")
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self.client.start_record)
+            await self._run(self.client.start_record)
             logger.info(f"[{self.name}] Started recording")
         except Exception as e:
             logger.error(f"[{self.name}] Failed to start recording: {e}")
@@ -122,8 +203,7 @@ class OBSClient:
         if not self.client:
             raise Exception("Not connected to OBS")
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self.client.stop_record)
+            await self._run(self.client.stop_record)
             logger.info(f"[{self.name}] Stopped recording")
         except Exception as e:
             logger.error(f"[{self.name}] Failed to stop recording: {e}")
@@ -134,8 +214,7 @@ class OBSClient:
         if not self.client:
             raise Exception("Not connected to OBS")
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self.client.start_stream)
+            await self._run(self.client.start_stream)
             logger.info(f"[{self.name}] Started streaming")
         except Exception as e:
             logger.error(f"[{self.name}] Failed to start streaming: {e}")
@@ -146,8 +225,7 @@ class OBSClient:
         if not self.client:
             raise Exception("Not connected to OBS")
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self.client.stop_stream)
+            await self._run(self.client.stop_stream)
             logger.info(f"[{self.name}] Stopped streaming")
         except Exception as e:
             logger.error(f"[{self.name}] Failed to stop streaming: {e}")
@@ -165,13 +243,10 @@ class OBSClient:
                     }
             
             # Get OBS info
-            loop = asyncio.get_event_loop()
-            
             def _get_info():
-                version = self.client.get_version()
-                scenes = self.client.get_scene_list()
-                profiles = self.client.get_profile_list()
-                collections = self.client.get_scene_collection_list()
+                version, scenes, profiles, collections = request_batch(
+                    self.client, "GetVersion", "GetSceneList", "GetProfileList", "GetSceneCollectionList"
+                )
                 
                 return {
                     "ok": True,
@@ -185,7 +260,7 @@ class OBSClient:
                     "current_collection": collections.current_scene_collection_name
                 }
             
-            info = await loop.run_in_executor(None, _get_info)
+            info = await self._run(_get_info)
             return info
             
         except Exception as e:
@@ -200,16 +275,14 @@ class OBSClient:
             return False
         
         try:
-            loop = asyncio.get_event_loop()
-            
             def _get_status():
-                record_status = self.client.get_record_status()
-                stream_status = self.client.get_stream_status()
-                scene = self.client.get_current_program_scene()
+                record_status, stream_status, scene = request_batch(
+                    self.client, "GetRecordStatus", "GetStreamStatus", "GetCurrentProgramScene"
+                )
                 return record_status.output_active, stream_status.output_active, scene.scene_name
             
-            self.recording, self.streaming, self.current_scene = await loop.run_in_executor(None, _get_status)
-            self.last_seen = datetime.utcnow()
+            self.recording, self.streaming, self.current_scene = await self._run(_get_status)
+            self.touch()
             logger.debug(f"[{self.name}] Status refreshed - Recording: {self.recording}, Streaming: {self.streaming}")
             return True
         except Exception as e:
@@ -217,38 +290,77 @@ class OBSClient:
             return False
     
     def get_status(self) -> Dict[str, Any]:
-        """Get current client status"""
-        return {
-            "connection_id": self.connection_id,
-            "name": self.name,
-            "connected": self.connected,
-            "recording": self.recording,
-            "streaming": self.streaming,
-            "current_scene": self.current_scene,
-            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
-            "last_error": self.last_error
-        }
+        """Get current client status
+        
+        The same dict is returned until one of its fields changes, so callers
+        must treat it as read-only.
+        """
+        key = (
+            self.connected,
+            self.recording,
+            self.streaming,
+            self.current_scene,
+            self.last_seen_iso,
+            self.last_error
+        )
+        if key != self._status_key:
+            self._status_cache = {
+                "connection_id": self.connection_id,
+                "name": self.name,
+                "connected": self.connected,
+                "recording": self.recording,
+                "streaming": self.streaming,
+                "current_scene": self.current_scene,
+                "last_seen": self.last_seen_iso,
+                "last_error": self.last_error
+            }
+            self._status_key = key
+        return self._status_cache
 
 
 class OBSManager:
     """Manager for multiple OBS connections"""
     
+    # Shared SQL text so the connection's statement cache reuses one prepared
+    # statement per query
+    _LOAD_CONNECTIONS_SQL = """
+        SELECT id, name, ws_url, password, auto_connect, roles_json
+        FROM so_obs_connections
+        WHERE enabled = 1
+    """
+    _UPDATE_STATUS_SQL = """
+        UPDATE so_obs_connections
+        SET last_status = ?, last_error = ?, last_seen_ts = ?, updated_at = ?
+        WHERE id = ?
+    """
+    
     def __init__(self, nats_service=None):
         self.nats = nats_service
         self.clients: Dict[str, OBSClient] = {}
         self._running = False
         self._event_task = None
         self._polling_task = None
+        # Status rows waiting to be written and the last ones written, keyed
+        # by connection id; one writer task batches them into a transaction
+        self._pending_status: Dict[str, tuple] = {}
+        self._written_status: Dict[str, tuple] = {}
+        self._status_wakeup = asyncio.Event()
+        self._status_writer: Optional[asyncio.Task] = None
+        # Strong references to detached tasks so they are not collected mid-run
+        self._background_tasks: Set[asyncio.Task] = set()
         
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run a coroutine in the background, keeping a reference until it ends"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+    
     async def load_all(self):
         """Load all enabled OBS connections from database"""
         try:
             db = await get_db()
-            cursor = await db.execute("""
-                SELECT id, name, ws_url, password, auto_connect, roles_json
-                FROM so_obs_connections
-                WHERE enabled = 1
-            """)
+            cursor = await db.execute(self._LOAD_CONNECTIONS_SQL)
             rows = await cursor.fetchall()
             
             for row in rows:
@@ -260,7 +372,7 @@ class OBSManager:
                 
                 # Auto-connect if configured
                 if auto_connect:
-                    asyncio.create_task(self._auto_connect(client))
+                    self._spawn(self._auto_connect(client))
                     
             logger.info(f"Loaded {len(self.clients)} OBS connections")
             
@@ -274,7 +386,7 @@ class OBSManager:
                 await self._update_status(client)
                 await self._setup_event_handlers(client)
                 # Start polling for this client
-                asyncio.create_task(self._start_polling(client))
+                self._spawn(self._start_polling(client))
                 return
             await asyncio.sleep(5 * (attempt + 1))  # Exponential backoff
         
@@ -287,35 +399,25 @@ class OBSManager:
             return
             
         try:
-            # TODO: Fix event handler registration for obsws-python 1.7.0
-            # The callback.register() method signature has changed
-            # For now, skip event handlers and rely on polling
-            logger.info(f"Event handlers disabled for {client.name} - using polling only")
-            return
+            loop = asyncio.get_running_loop()
             
-            loop = asyncio.get_event_loop()
+            # obsws-python dispatches on the callback's function name and calls
+            # it from the EventClient thread, so hand each event to the loop
+            def on_record_state_changed(data):
+                asyncio.run_coroutine_threadsafe(self._on_recording_started(client, data), loop)
             
-            def register_handlers():
-                # For obsws-python, use on() method to register event handlers
-                # Recording events
-                def on_record_state(data):
-                    asyncio.create_task(self._on_recording_started(client, data))
-                
-                # Streaming events  
-                def on_stream_state(data):
-                    asyncio.create_task(self._on_streaming_started(client, data))
-                
-                # Scene changes
-                def on_scene_changed(data):
-                    asyncio.create_task(self._on_scene_changed(client, data))
-                
-                client.event_client.callback.register([
-                    on_record_state,
-                    on_stream_state,
-                    on_scene_changed
-                ])
+            def on_stream_state_changed(data):
+                asyncio.run_coroutine_threadsafe(self._on_streaming_started(client, data), loop)
+            
+            def on_current_program_scene_changed(data):
+                asyncio.run_coroutine_threadsafe(self._on_scene_changed(client, data), loop)
             
-            await loop.run_in_executor(None, register_handlers)
+            client.event_client.callback.register([
+                on_record_state_changed,
+                on_stream_state_changed,
+                on_current_program_scene_changed
+            ])
+            client.events_active = True
             logger.info(f"Event handlers registered for {client.name}")
             
         except Exception as e:
@@ -324,8 +426,12 @@ class OBSManager:
     async def _on_recording_started(self, client: OBSClient, data):
         """Handle recording state change"""
         try:
+            client.last_event_ts = time.monotonic()
+            client.touch()
+            # Also fired for STARTING/STOPPING; act only when the state flips
+            if data.output_active == client.recording:
+                return
             client.recording = data.output_active
-            client.last_seen = datetime.utcnow()
             
             if data.output_active:
                 # Recording started
@@ -344,8 +450,11 @@ class OBSManager:
     async def _on_streaming_started(self, client: OBSClient, data):
         """Handle streaming state change"""
         try:
+            client.last_event_ts = time.monotonic()
+            client.touch()
+            if data.output_active == client.streaming:
+                return
             client.streaming = data.output_active
-            client.last_seen = datetime.utcnow()
             
             if data.output_active:
                 logger.info(f"[{client.name}] Streaming started (via event)")
@@ -362,19 +471,20 @@ class OBSManager:
     async def _on_scene_changed(self, client: OBSClient, data):
         """Handle scene change"""
         try:
+            client.last_event_ts = time.monotonic()
             client.current_scene = data.scene_name
-            client.last_seen = datetime.utcnow()
+            client.touch()
             
             # Emit event
             event_data = {
                 "connection_id": client.connection_id,
                 "connection_name": client.name,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": client.last_seen_iso,
                 "scene": data.scene_name
             }
             
             if self.nats:
-                await self.nats.publish("events.obs.scene_changed", json.dumps(event_data))
+                await self.nats.publish_event("obs.scene_changed", event_data)
             
             logger.info(f"[{client.name}] Scene changed to {data.scene_name}")
             await self._update_status(client)
@@ -386,18 +496,27 @@ class OBSManager:
     async def _start_polling(self, client: OBSClient):
         """Start polling for a specific client's status"""
         logger.info(f"Starting status polling for {client.name}")
-        
-        # Track previous states to detect changes
-        prev_recording = client.recording
-        prev_streaming = client.streaming
+        last_heartbeat = time.monotonic()
         
         while client.connected:
             try:
-                await asyncio.sleep(5)  # Poll every 5 seconds
+                if client.events_active:
+                    # Jittered so clients don't all probe at the same moment
+                    await asyncio.sleep(EVENT_POLL_INTERVAL + random.random() * EVENT_POLL_JITTER)
+                    if time.monotonic() - client.last_event_ts < EVENT_FRESH_SECONDS:
+                        # Recent events already touched last_seen; keep the
+                        # stored heartbeat current without asking OBS again
+                        if time.monotonic() - last_heartbeat >= HEARTBEAT_INTERVAL:
+                            last_heartbeat = time.monotonic()
+                            await self._update_status(client)
+                        continue
+                else:
+                    await asyncio.sleep(POLL_INTERVAL)
                 if client.connected:
                     # Store previous states before refresh
                     prev_recording = client.recording
                     prev_streaming = client.streaming
+                    prev_scene = client.current_scene
                     
                     # Refresh status from OBS
                     await client.refresh_status()
@@ -418,8 +537,12 @@ class OBSManager:
                         logger.info(f"[{client.name}] Streaming started (detected via polling)")
                         await self._handle_streaming_started(client)
                     
-                    # Update database with current status
-                    await self._update_status(client)
+                    # Write when something changed, and otherwise often enough
+                    # that last_seen_ts stays fresh for an idle OBS
+                    changed = (client.recording, client.streaming, client.current_scene) != (prev_recording, prev_streaming, prev_scene)
+                    if changed or time.monotonic() - last_heartbeat >= HEARTBEAT_INTERVAL:
+                        last_heartbeat = time.monotonic()
+                        await self._update_status(client)
             except Exception as e:
                 logger.error(f"Error polling status for {client.name}: {e}")
                 # Continue polling even on error
@@ -432,7 +555,7 @@ class OBSManager:
             event_data = {
                 "connection_id": client.connection_id,
                 "connection_name": client.name,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": client.last_seen_iso,
                 "scene": client.current_scene,
                 "state": "recording"
             }
@@ -442,7 +565,6 @@ class OBSManager:
             
             # Broadcast SSE event for immediate UI update
             try:
-                from app.api.routers.events import notify_recording_state
                 await notify_recording_state(True, client.name)
                 logger.info(f"Sent recording started notification for {client.name}")
             except Exception as e:
@@ -460,7 +582,7 @@ class OBSManager:
             event_data = {
                 "connection_id": client.connection_id,
                 "connection_name": client.name,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": client.last_seen_iso,
                 "scene": client.current_scene,
                 "state": "streaming"
             }
@@ -469,8 +591,10 @@ class OBSManager:
                 await self.nats.publish_event("obs.streaming_started", event_data)
             
             # Broadcast SSE event for immediate UI update
-            from app.api.routers.events import notify_recording_state
-            asyncio.create_task(notify_recording_state(True, client.name))
+            try:
+                await notify_recording_state(True, client.name)
+            except Exception as e:
+                logger.error(f"Failed to send streaming started notification: {e}")
             
             logger.info(f"Streaming started for {client.name}")
             
@@ -484,7 +608,7 @@ class OBSManager:
             event_data = {
                 "connection_id": client.connection_id,
                 "connection_name": client.name,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": client.last_seen_iso,
                 "scene": client.current_scene,
                 "state": "idle"
             }
@@ -493,8 +617,10 @@ class OBSManager:
                 await self.nats.publish_event("obs.streaming_stopped", event_data)
             
             # Broadcast SSE event for immediate UI update
-            from app.api.routers.events import notify_recording_state
-            asyncio.create_task(notify_recording_state(False, client.name))
+            try:
+                await notify_recording_state(False, client.name)
+            except Exception as e:
+                logger.error(f"Failed to send streaming stopped notification: {e}")
             
             logger.info(f"Streaming stopped for {client.name}")
             
@@ -508,7 +634,7 @@ class OBSManager:
             event_data = {
                 "connection_id": client.connection_id,
                 "connection_name": client.name,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": client.last_seen_iso,
                 "scene": client.current_scene,
                 "state": "idle"
             }
@@ -518,7 +644,6 @@ class OBSManager:
             
             # Broadcast SSE event for immediate UI update
             try:
-                from app.api.routers.events import notify_recording_state
                 await notify_recording_state(False, client.name)
                 logger.info(f"Sent recording stopped notification for {client.name}")
             except Exception as e:
@@ -526,7 +651,7 @@ class OBSManager:
             
             # Scan immediately - OBS recordings are complete when stopped
             logger.info(f"Recording stopped for {client.name}, scanning for new files immediately")
-            asyncio.create_task(self._trigger_recording_scan())
+            self._spawn(self._trigger_recording_scan())
             
         except Exception as e:
             logger.error(f"Failed to handle recording stopped: {e}")
@@ -555,28 +680,51 @@ class OBSManager:
             logger.error(f"Failed to trigger recording scan: {e}")
     
     async def _update_status(self, client: OBSClient):
-        """Update client status in database"""
+        """Queue a status update for the database
+        
+        Rows identical to the last one written are dropped, and repeated
+        updates for a client before the writer runs collapse into one.
+        """
+        status = "connected" if client.connected else "disconnected"
+        if client.last_error and not client.connected:
+            status = f"error:{client.last_error[:100]}"
+        row = (
+            status,
+            client.last_error,
+            client.last_seen_iso
+        )
+        if self._written_status.get(client.connection_id) == row:
+            self._pending_status.pop(client.connection_id, None)
+            return
+        
+        self._pending_status[client.connection_id] = row
+        if self._status_writer is None or self._status_writer.done():
+            self._status_writer = asyncio.create_task(self._status_writer_loop())
+        self._status_wakeup.set()
+    
+    async def _status_writer_loop(self):
+        """Write queued status rows whenever new ones arrive"""
+        while True:
+            await self._status_wakeup.wait()
+            self._status_wakeup.clear()
+            await self._write_pending_status()
+    
+    async def _write_pending_status(self):
+        """Write all queued status rows in one transaction"""
+        if not self._pending_status:
+            return
+        pending, self._pending_status = self._pending_status, {}
+        updated_at = datetime.utcnow().isoformat()
         try:
             db = await get_db()
-            status = "connected" if client.connected else "disconnected"
-            if client.last_error and not client.connected:
-                status = f"error:{client.last_error[:100]}"
-            
-            await db.execute("""
-                UPDATE so_obs_connections
-                SET last_status = ?, last_error = ?, last_seen_ts = ?, updated_at = ?
-                WHERE id = ?
-            """, (
-                status,
-                client.last_error,
-                client.last_seen.isoformat() if client.last_seen else None,
-                datetime.utcnow().isoformat(),
-                client.connection_id
-            ))
+            await db.executemany(self._UPDATE_STATUS_SQL, [
+                (status, last_error, last_seen, updated_at, connection_id)
+                for connection_id, (status, last_error, last_seen) in pending.items()
+            ])
             await db.commit()
-            
+            self._written_status.update(pending)
         except Exception as e:
-            logger.error(f"Failed to update status for {client.name}: {e}")
+            logger.error(f"Failed to update status for {len(pending)} OBS connections: {e}")
     
     async def connect(self, connection_id: str) -> bool:
         """Connect a specific OBS instance"""
@@ -604,8 +752,10 @@ class OBSManager:
         if success:
             await self._setup_event_handlers(client)
             # Start polling for this client
-            asyncio.create_task(self._start_polling(client))
+            self._spawn(self._start_polling(client))
         await self._update_status(client)
+        # Write now so the connection list reflects this request
+        await self._write_pending_status()
         return success
     
     async def disconnect(self, connection_id: str) -> bool:
@@ -616,12 +766,19 @@ class OBSManager:
         client = self.clients[connection_id]
         await client.disconnect()
         await self._update_status(client)
+        await self._write_pending_status()
         return True
     
     async def disconnect_all(self):
         """Disconnect all OBS instances"""
         for connection_id in list(self.clients.keys()):
             await self.disconnect(connection_id)
+        
+        if self._status_writer is not None:
+            self._status_writer.cancel()
+            await asyncio.gather(self._status_writer, return_exceptions=True)
+            self._status_writer = None
+        await self._write_pending_status()
         logger.info("Disconnected all OBS connections")
     
     async def test(self, connection_id: str) -> Dict[str, Any]:
@@ -644,13 +801,13 @@ class OBSManager:
         else:
             client = self.clients[connection_id]
         
-        result = await client.test_connection()
-        
-        # Disconnect if we created a temporary client
-        if connection_id not in self.clients and client.connected:
-            await client.disconnect()
-        
-        return result
+        try:
+            return await client.test_connection()
+        finally:
+            # Always tear down a temporary client, even after a failed connect,
+            # so its sockets and executor thread are released
+            if connection_id not in self.clients:
+                await client.disconnect()
     
     def get_state(self, scope: Optional[str] = None) -> Dict[str, Any]:
         """Get current state of all connections"""
@@ -685,10 +842,7 @@ class OBSManager:
     
     async def get_all_statuses(self) -> Dict[str, Dict[str, Any]]:
         """Get status for all connections"""
-        statuses = {}
-        for connection_id, client in self.clients.items():
-            statuses[connection_id] = client.get_status()
-        return statuses
+        return {connection_id: client.get_status() for connection_id, client in self.clients.items()}
     
     async def connect_all_autostart(self):
         """Connect all auto-start enabled connections"""
@@ -340,7 +340,7 @@ class RulesEngine:
                 return (field_value or 0) < expected_value
             
             elif operator == RuleConditionOperator.regex_match:
-                return bool(re.match(str(expected_value), str(field_value))) if field_value else False
+                return bool(condition.pattern.match(str(field_value))) if field_value else False
             
             elif operator == RuleConditionOperator.file_exists:
                 file_path = self._substitute_variables(str(expected_value), event_data)
@@ -2,11 +2,12 @@
 
 import os
 import base64
+import hashlib
 import logging
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -106,8 +107,10 @@ class EncryptionService:
             return False
         
         try:
-            # Try to decode as base64
-            decoded = base64.b64decode(value.encode('utf-8'))
+            # encrypt() wraps the Fernet token, itself urlsafe base64, in a
+            # second layer of base64
+            token = base64.b64decode(value.encode('utf-8'), validate=True)
+            decoded = base64.urlsafe_b64decode(token)
             # Check if it looks like Fernet token (starts with version byte)
             return len(decoded) > 0 and decoded[0] == 0x80
         except:
@@ -130,8 +133,28 @@ SENSITIVE_FIELDS = [
 ]
 
 
-def encrypt_sensitive_fields(data: dict, path: str = "") -> dict:
-    """Recursively encrypt sensitive fields in a dictionary"""
+# Bound on nested ciphertext unwrapped when loading a value
+MAX_ENCRYPTION_LAYERS = 16
+
+
+# Random per-process key so cached plaintext digests are useless outside it
+_DIGEST_KEY = os.urandom(16)
+
+
+def _plaintext_digest(value: str) -> bytes:
+    return hashlib.blake2b(value.encode(), digest_size=16, key=_DIGEST_KEY).digest()
+
+
+def encrypt_sensitive_fields(
+    data: dict,
+    path: str = "",
+    cache: Optional[Dict[str, Tuple[bytes, str]]] = None
+) -> dict:
+    """Recursively encrypt sensitive fields in a dictionary
+    
+    If cache is given it maps field path -> (plaintext digest, ciphertext),
+    and a field whose plaintext has not changed reuses its old ciphertext.
+    """
     result = {}
     
     for key, value in data.items():
@@ -139,12 +162,25 @@ def encrypt_sensitive_fields(data: dict, path: str = "") -> dict:
         
         if isinstance(value, dict):
             # Recurse into nested dictionaries
-            result[key] = encrypt_sensitive_fields(value, current_path)
+            result[key] = encrypt_sensitive_fields(value, current_path, cache)
         elif current_path in SENSITIVE_FIELDS or key in SENSITIVE_FIELDS:
             # Encrypt sensitive field if it's not already encrypted
             if value and isinstance(value, str):
                 if not encryption_service.is_encrypted(value):
-                    result[key] = encryption_service.encrypt(value)
+                    if cache is None:
+                        result[key] = encryption_service.encrypt(value)
+                        logger.debug(f"Encrypted field: {current_path}")
+                        continue
+                    digest = _plaintext_digest(value)
+                    cached = cache.get(current_path)
+                    if cached is not None and cached[0] == digest:
+                        result[key] = cached[1]
+                        continue
+                    encrypted = encryption_service.encrypt(value)
+                    # Don't remember the plaintext fallback of a failed encrypt
+                    if not encrypted.startswith("UNENCRYPTED:"):
+                        cache[current_path] = (digest, encrypted)
+                    result[key] = encrypted
                     logger.debug(f"Encrypted field: {current_path}")
                 else:
                     result[key] = value
@@ -156,6 +192,21 @@ def encrypt_sensitive_fields(data: dict, path: str = "") -> dict:
     return result
 
 
+def has_plaintext_sensitive_fields(data: dict, path: str = "") -> bool:
+    """Check whether any sensitive field holds a value that is not encrypted"""
+    for key, value in data.items():
+        current_path = f"{path}.{key}" if path else key
+        
+        if isinstance(value, dict):
+            if has_plaintext_sensitive_fields(value, current_path):
+                return True
+        elif current_path in SENSITIVE_FIELDS or key in SENSITIVE_FIELDS:
+            if value and isinstance(value, str) and not encryption_service.is_encrypted(value):
+                return True
+    
+    return False
+
+
 def decrypt_sensitive_fields(data: dict, path: str = "") -> dict:
     """Recursively decrypt sensitive fields in a dictionary"""
     result = {}
@@ -170,7 +221,14 @@ def decrypt_sensitive_fields(data: dict, path: str = "") -> dict:
             # Decrypt sensitive field if it's encrypted
             if value and isinstance(value, str):
                 if encryption_service.is_encrypted(value):
-                    result[key] = encryption_service.decrypt(value)
+                    # Older saves could encrypt a value more than once; peel
+                    # off every layer
+                    decrypted = encryption_service.decrypt(value)
+                    for _ in range(MAX_ENCRYPTION_LAYERS):
+                        if decrypted == value or not encryption_service.is_encrypted(decrypted):
+                            break
+                        value, decrypted = decrypted, encryption_service.decrypt(decrypted)
+                    result[key] = decrypted
                     logger.debug(f"Decrypted field: {current_path}")
                 else:
                     result[key] = value
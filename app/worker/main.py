@@ -7,6 +7,7 @@ from datetime import datetime
 
 from app.api.services.nats_service import NATSService
 from app.api.db.database import init_db, close_db
+from app.api.services.asset_events import AssetEventService
 from app.worker.jobs.remux import RemuxJob
 from app.worker.jobs.proxy import ProxyJob
 from app.worker.jobs.transcode import TranscodeJob
@@ -40,6 +41,7 @@ class Worker:
         
         # Initialize database
         await init_db()
+        await AssetEventService.start()
         
         # Connect to NATS
         self.nats = NATSService()
@@ -76,7 +78,8 @@ class Worker:
         if self.nats:
             await self.nats.disconnect()
         
-        # Close database
+        # Flush pending asset events and close database
+        await AssetEventService.stop()
         await close_db()
         
         logger.info("StreamOps Worker stopped")
@@ -18,6 +18,9 @@ from .template import expand_template, build_target_path
 
 logger = logging.getLogger(__name__)
 
+# Seconds before a job whose NATS publish was not confirmed is published again
+PUBLISH_RETRY_DELAY = 30
+
 
 class RulesEngine:
     """Rules engine for automating media processing workflows - strictly sequential"""
@@ -901,11 +904,41 @@ class RulesEngine:
             payload['id'] = job['id']
             payload['asset_id'] = job['asset_id']
             
-            await self.nats.publish_job(job['type'], payload)
-            logger.info(f"Published queued job {job['id']} of type {job['type']} to NATS")
+            await self.nats.publish_job_async(job['type'], payload)
+            logger.info(f"Sent queued job {job['id']} of type {job['type']} to NATS")
+        await self._requeue_unpublished(await self.nats.flush())
         
         return len(jobs)
     
+    async def _requeue_unpublished(self, job_ids: List[str]):
+        """Defer jobs whose publish NATS did not confirm so they are retried
+        
+        The jobs are already queued in the database, so without this nothing
+        would ever publish them again. The deferred scheduler promotes them
+        once next_run_at passes.
+        """
+        if not job_ids:
+            return
+        
+        retry_at = (datetime.utcnow() + timedelta(seconds=PUBLISH_RETRY_DELAY)).isoformat()
+        placeholders = ','.join('?' * len(job_ids))
+        conn = await aiosqlite.connect("/data/db/streamops.db")
+        try:
+            await conn.execute(f"""
+                UPDATE so_jobs
+                SET state = 'deferred',
+                    blocked_reason = 'publish_failed',
+                    next_run_at = ?,
+                    updated_at = ?
+                WHERE id IN ({placeholders})
+                AND state = 'queued'
+            """, (retry_at, datetime.utcnow().isoformat(), *job_ids))
+            await conn.commit()
+        finally:
+            await conn.close()
+        
+        logger.warning(f"{len(job_ids)} job publishes were not confirmed, retrying after {PUBLISH_RETRY_DELAY}s: {', '.join(map(str, job_ids))}")
+    
     async def _activate_deferred_jobs(self):
         """Activate all deferred jobs that are ready to run"""
         conn = await aiosqlite.connect("/data/db/streamops.db")
@@ -958,10 +991,11 @@ class RulesEngine:
                     payload['asset_id'] = job['asset_id']
                     
                     logger.info(f"Publishing job payload: {payload}")
-                    await self.nats.publish_job(job['type'], payload)
-                    logger.info(f"Published deferred job {job['id']} of type {job['type']} to NATS")
+                    await self.nats.publish_job_async(job['type'], payload)
+                    logger.info(f"Sent deferred job {job['id']} of type {job['type']} to NATS")
                 else:
                     logger.info(f"Skipping dependent job {job['id']} - will be triggered when {job['depends_on']} completes")
+            await self._requeue_unpublished(await self.nats.flush())
         
         return len(jobs)
     
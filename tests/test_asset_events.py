@@ -0,0 +1,248 @@
+import pytest
+import orjson
+
+from app.api.services import asset_events
+from app.api.services.asset_events import AssetEventService
+
+
+@pytest.fixture
+async def event_service(test_db):
+    """Run the asset event flusher against the test database."""
+    for asset_id in ("asset_1", "asset_2"):
+        await test_db.execute(
+            "INSERT INTO so_assets (id, abs_path) VALUES (?, ?)",
+            (asset_id, f"/media/{asset_id}.mp4")
+        )
+    # Events reference jobs, so the job ids used below must exist
+    await test_db.executemany(
+        "INSERT INTO so_jobs (id, type, payload_json) VALUES (?, 'test', '{}')",
+        [(f"job_{n}",) for n in range(200)]
+    )
+    await test_db.commit()
+    AssetEventService._seen.clear()
+    await AssetEventService.start()
+
+    yield AssetEventService
+
+    await AssetEventService.stop()
+    AssetEventService._seen.clear()
+
+
+async def _event_count(db, asset_id):
+    cursor = await db.execute(
+        "SELECT COUNT(*) FROM so_asset_events WHERE asset_id = ?",
+        (asset_id,)
+    )
+    return (await cursor.fetchone())[0]
+
+
+class TestAssetEventFlusher:
+
+    @pytest.mark.unit
+    async def test_emit_event_stores_row(self, event_service, test_db):
+        """Test that an emitted event is written before emit_event returns."""
+        ok = await event_service.emit_event("asset_1", "recorded", {"path": "/media/asset_1.mp4"})
+
+        assert ok is True
+        assert await _event_count(test_db, "asset_1") == 1
+
+    @pytest.mark.unit
+    async def test_repeat_event_is_skipped(self, event_service, test_db, monkeypatch):
+        """Test that an event already stored by this process never reaches the queue."""
+        await event_service.emit_event("asset_1", "recorded", {})
+
+        queued = []
+        monkeypatch.setattr(event_service._queue, "put_nowait", queued.append)
+        ok = await event_service.emit_event("asset_1", "recorded", {})
+
+        assert ok is True
+        assert queued == []
+        assert await _event_count(test_db, "asset_1") == 1
+
+    @pytest.mark.unit
+    async def test_duplicate_row_is_ignored(self, event_service, test_db):
+        """Test that INSERT OR IGNORE dedupes events the process has forgotten."""
+        await event_service.emit_event("asset_1", "remux_completed", {}, job_id="job_1")
+        event_service._seen.clear()
+
+        ok = await event_service.emit_event("asset_1", "remux_completed", {}, job_id="job_1")
+
+        assert ok is True
+        assert await _event_count(test_db, "asset_1") == 1
+
+    @pytest.mark.unit
+    async def test_bulk_events_are_batched(self, event_service, test_db, monkeypatch):
+        """Test that queued events are written in batches of at most BATCH_SIZE."""
+        batch_sizes = []
+        write_batch = event_service._write_batch
+
+        async def recording_write_batch(batch):
+            batch_sizes.append(len(batch))
+            await write_batch(batch)
+
+        monkeypatch.setattr(event_service, "_write_batch", recording_write_batch)
+        events = [
+            {"asset_id": "asset_2", "event_type": "proxy_completed", "payload": {"n": n}, "job_id": f"job_{n}"}
+            for n in range(200)
+        ]
+
+        ok = await event_service.emit_events_bulk(events)
+
+        assert ok is True
+        assert await _event_count(test_db, "asset_2") == 200
+        assert sum(batch_sizes) == 200
+        assert max(batch_sizes) <= asset_events.BATCH_SIZE
+        assert len(batch_sizes) < 200
+
+    @pytest.mark.unit
+    async def test_stop_flushes_pending_events(self, event_service, test_db):
+        """Test that stop() writes events that are still queued."""
+        futures = [
+            event_service._enqueue("asset_1", "move_completed", {"n": n}, f"job_{n}")
+            for n in range(5)
+        ]
+
+        await event_service.stop()
+
+        assert all(future.done() and future.result() is True for future in futures)
+        assert await _event_count(test_db, "asset_1") == 5
+
+    @pytest.mark.unit
+    async def test_failed_write_resolves_false(self, event_service):
+        """Test that a failed insert reports False instead of hanging."""
+        ok = await event_service.emit_event("missing_asset", "recorded", {})
+
+        assert ok is False
+        assert event_service.generate_event_id("missing_asset", "recorded") not in event_service._seen
+
+    @pytest.mark.unit
+    def test_seen_evicts_least_recent(self, monkeypatch):
+        """Test that the seen set keeps only the most recently used ids."""
+        monkeypatch.setattr(asset_events, "SEEN_MAX", 3)
+        AssetEventService._seen.clear()
+
+        AssetEventService._mark_seen(["a", "b", "c"])
+        AssetEventService._mark_seen(["a", "d"])
+
+        assert list(AssetEventService._seen) == ["c", "a", "d"]
+        AssetEventService._seen.clear()
+
+
+class TestAssetTimeline:
+
+    @pytest.mark.unit
+    async def test_timeline_formats_timestamps(self, event_service, test_db):
+        """Test that epoch millisecond timestamps come back as UTC ISO strings."""
+        await test_db.execute(
+            "INSERT INTO so_asset_events (id, asset_id, event_type, payload_json, created_at) VALUES (?, ?, ?, ?, ?)",
+            ("evt_1", "asset_1", "recorded", '{"path": "/media/asset_1.mp4"}', 1700000000000)
+        )
+        await test_db.commit()
+
+        timeline = await event_service.get_asset_timeline("asset_1")
+
+        assert timeline == [{
+            "event_type": "recorded",
+            "payload": {"path": "/media/asset_1.mp4"},
+            "job_id": None,
+            "created_at": "2023-11-14T22:13:20+00:00"
+        }]
+
+    @pytest.mark.unit
+    async def test_timeline_handles_null_timestamp(self, event_service, test_db):
+        """Test that a row without created_at streams instead of failing."""
+        await test_db.execute(
+            "INSERT INTO so_asset_events (id, asset_id, event_type, payload_json, created_at) VALUES (?, ?, ?, ?, NULL)",
+            ("evt_1", "asset_1", "recorded", "{}")
+        )
+        await test_db.commit()
+
+        streamed = [event async for event in event_service.iter_asset_timeline("asset_1")]
+
+        assert streamed[0]["created_at"] is None
+        assert await event_service.get_asset_timeline("asset_1") == streamed
+
+    @pytest.mark.unit
+    async def test_timeline_endpoint_pages_rows(self, event_service, test_db, monkeypatch):
+        """Test that the streamed timeline spans several pages in order."""
+        from app.api.routers.assets import get_asset_timeline
+
+        monkeypatch.setattr(asset_events, "TIMELINE_PAGE_SIZE", 2)
+        await test_db.executemany(
+            "INSERT INTO so_asset_events (id, asset_id, event_type, payload_json, created_at) VALUES (?, 'asset_1', 'recorded', ?, ?)",
+            [(f"evt_{n}", orjson.dumps({"n": n}).decode(), 1700000000000 + n) for n in range(5)]
+        )
+        await test_db.commit()
+
+        response = await get_asset_timeline("asset_1")
+        body = b"".join([chunk async for chunk in response.body_iterator])
+
+        assert [event["payload"]["n"] for event in orjson.loads(body)] == [0, 1, 2, 3, 4]
+
+    @pytest.mark.unit
+    async def test_timeline_endpoint_aborts_on_error(self, event_service, monkeypatch):
+        """Test that an error mid-stream aborts the body instead of closing the array."""
+        from app.api.routers.assets import get_asset_timeline
+
+        async def failing_timeline(asset_id):
+            yield {"event_type": "recorded"}
+            raise RuntimeError("database is locked")
+
+        monkeypatch.setattr(event_service, "iter_asset_timeline", failing_timeline)
+        response = await get_asset_timeline("asset_1")
+        chunks = []
+
+        with pytest.raises(RuntimeError):
+            async for chunk in response.body_iterator:
+                chunks.append(chunk)
+
+        assert b"".join(chunks) == b'[{"event_type":"recorded"}'
+
+    @pytest.mark.unit
+    async def test_timeline_endpoint_reports_query_errors(self, event_service, monkeypatch):
+        """Test that a failure before the first row is a 500, not an empty array."""
+        from fastapi import HTTPException
+        from app.api.routers.assets import get_asset_timeline
+
+        async def failing_timeline(asset_id):
+            raise RuntimeError("database is locked")
+            yield
+
+        monkeypatch.setattr(event_service, "iter_asset_timeline", failing_timeline)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await get_asset_timeline("asset_1")
+
+        assert exc_info.value.status_code == 500
+
+
+class TestAssetHistory:
+
+    @pytest.mark.unit
+    async def test_history_merges_jobs_and_events(self, event_service, test_db):
+        """Test that history mixes job and event timestamps and dedupes job events."""
+        from app.api.routers.assets import get_asset_history
+
+        await test_db.executemany(
+            "INSERT INTO so_jobs (id, type, asset_id, payload_json, state, finished_at) VALUES (?, ?, 'asset_1', ?, 'completed', ?)",
+            [
+                ("job_move", "move", '{"source_path": "/a", "dest_path": "/b"}', "2023-11-14 22:13:50"),
+                ("job_copy", "copy", '{"source_path": "/b", "dest_path": "/c"}', "2023-11-14 23:00:00"),
+            ]
+        )
+        await test_db.executemany(
+            "INSERT INTO so_asset_events (id, asset_id, event_type, payload_json, created_at) VALUES (?, 'asset_1', ?, ?, ?)",
+            [
+                ("evt_1", "move_completed", '{"from": "/a", "to": "/b"}', 1700000000000),
+                ("evt_2", "remux_completed", '{"from": "/b", "to": "/b.mp4"}', 1700000100000),
+            ]
+        )
+        await test_db.commit()
+
+        history = (await get_asset_history("asset_1", db=test_db))["history"]
+
+        assert [(e["type"], e["timestamp"]) for e in history[1:]] == [
+            ("moved", "2023-11-14T22:13:20+00:00"),
+            ("remuxed", "2023-11-14T22:15:00+00:00"),
+            ("copied", "2023-11-14 23:00:00"),
+        ]
@@ -0,0 +1,104 @@
+import stat
+import pytest
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+
+from app.api.services.config_service import ConfigService, StreamOpsConfig
+from app.api.utils.encryption import encryption_service, decrypt_sensitive_fields
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    """Point the config service at a temporary config file."""
+    path = tmp_path / "config.json"
+    monkeypatch.setenv("CONFIG_PATH", str(path))
+    return path
+
+
+class TestConfigEncryption:
+
+    @pytest.mark.unit
+    async def test_legacy_plaintext_secret_is_encrypted_on_load(self, config_path):
+        """Test that a plaintext secret from an older config is rewritten encrypted."""
+        # A complete config, so the only reason to rewrite it is the secret
+        config_path.write_bytes(orjson.dumps({
+            **StreamOpsConfig().model_dump(),
+            "custom": {"email_smtp_pass": "hunter2"}
+        }))
+
+        service = ConfigService()
+        await service.load_config()
+
+        on_disk = orjson.loads(config_path.read_bytes())
+        stored = on_disk["custom"]["email_smtp_pass"]
+        assert b"hunter2" not in config_path.read_bytes()
+        assert encryption_service.is_encrypted(stored)
+        assert encryption_service.decrypt(stored) == "hunter2"
+
+    @pytest.mark.unit
+    async def test_secret_survives_reload(self, config_path):
+        """Test that an encrypted secret loads back as plaintext."""
+        config_path.write_bytes(orjson.dumps({
+            "custom": {"email_smtp_pass": "hunter2"}
+        }))
+        await ConfigService().load_config()
+
+        service = ConfigService()
+        await service.load_config()
+
+        assert service._custom_config["email_smtp_pass"] == "hunter2"
+        assert b"hunter2" not in config_path.read_bytes()
+
+    @pytest.mark.unit
+    async def test_unchanged_encrypted_config_is_not_rewritten(self, config_path):
+        """Test that loading an already encrypted config leaves the file alone."""
+        config_path.write_bytes(orjson.dumps({
+            "custom": {"email_smtp_pass": "hunter2"}
+        }))
+        await ConfigService().load_config()
+        written = config_path.read_bytes()
+
+        await ConfigService().load_config()
+
+        assert config_path.read_bytes() == written
+
+    @pytest.mark.unit
+    def test_encrypted_value_is_recognized(self):
+        """Test that encrypt() output is detected as encrypted."""
+        assert encryption_service.is_encrypted(encryption_service.encrypt("hunter2"))
+        assert not encryption_service.is_encrypted("hunter2")
+
+    @pytest.mark.unit
+    def test_nested_encryption_is_unwrapped(self):
+        """Test that a value encrypted more than once decrypts to plaintext."""
+        twice = encryption_service.encrypt(encryption_service.encrypt("hunter2"))
+
+        decrypted = decrypt_sensitive_fields({"custom": {"email_smtp_pass": twice}})
+
+        assert decrypted["custom"]["email_smtp_pass"] == "hunter2"
+
+
+class TestConfigWrite:
+
+    @pytest.mark.unit
+    def test_written_file_is_private(self, tmp_path):
+        """Test that the config is written 0600 and no temp files are left."""
+        path = tmp_path / "config.json"
+
+        ConfigService._write_file(path, b"{}")
+
+        assert path.read_bytes() == b"{}"
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+        assert [p.name for p in tmp_path.iterdir()] == ["config.json"]
+
+    @pytest.mark.unit
+    def test_concurrent_writes_do_not_collide(self, tmp_path):
+        """Test that saves racing from several writers all complete."""
+        path = tmp_path / "config.json"
+        payloads = [orjson.dumps({"writer": n}) for n in range(16)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda payload: ConfigService._write_file(path, payload), payloads))
+
+        assert path.read_bytes() in payloads
+        assert [p.name for p in tmp_path.iterdir()] == ["config.json"]
@@ -0,0 +1,114 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+from nats.errors import TimeoutError as NatsTimeoutError
+
+from app.api.services import nats_service
+from app.api.services.nats_service import NATSService
+
+
+class ScriptedSubscription:
+    """Pull subscription that replays fetch results and records batch sizes."""
+
+    def __init__(self, service, results):
+        self.service = service
+        self.results = list(results)
+        self.batches = []
+
+    async def fetch(self, batch, timeout, heartbeat=None):
+        self.batches.append(batch)
+        if not self.results:
+            self.service._connected = False
+            raise NatsTimeoutError
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return [Mock() for _ in range(result)]
+
+
+@pytest.fixture
+async def service():
+    """A NATS service with its handler workers running."""
+    service = NATSService()
+    service._connected = True
+    service._start_workers()
+
+    yield service
+
+    for worker in service._workers:
+        worker.cancel()
+    await asyncio.gather(*service._workers, return_exceptions=True)
+
+
+class TestConsumeLoop:
+
+    @pytest.mark.unit
+    async def test_idle_poll_returns_to_full_batches(self, service):
+        """Test that a job on the idle poll switches back to batch fetches."""
+        subscription = ScriptedSubscription(service, [10, 3, 1, 10, NatsTimeoutError(), 1, 4])
+        handled = []
+
+        async def handler(msg):
+            handled.append(msg)
+
+        await service._consume_messages(subscription, handler, batch=10, timeout=0.01)
+
+        # full, short -> idle poll, job -> full, timeout -> idle poll, job -> full, short -> idle
+        assert subscription.batches == [10, 10, 1, 10, 10, 1, 10, 1]
+        assert len(handled) == 29
+
+    @pytest.mark.unit
+    async def test_empty_idle_poll_stays_idle(self, service):
+        """Test that an idle poll that returns nothing keeps long polling."""
+        subscription = ScriptedSubscription(service, [0, 0, 0])
+
+        await service._consume_messages(subscription, AsyncMock(), batch=10, timeout=0.01)
+
+        assert subscription.batches == [10, 1, 1, 1]
+
+
+@pytest.fixture
+def publisher(monkeypatch):
+    """A NATS service whose async publishes return futures the test resolves."""
+    monkeypatch.setattr(nats_service, "FLUSH_ACK_TIMEOUT", 0.05)
+    service = NATSService()
+    service._connected = True
+    service.acks = {}
+
+    async def publish_async(subject, payload, headers=None):
+        future = asyncio.get_running_loop().create_future()
+        service.acks[headers["X-Job-Id"]] = future
+        return future
+
+    service.js = Mock()
+    service.js.publish_async = publish_async
+    return service
+
+
+class TestFlush:
+
+    @pytest.mark.unit
+    async def test_flush_reports_unconfirmed_jobs(self, publisher):
+        """Test that rejected and unacked publishes are returned without hanging."""
+        for job_id in ("job_ok", "job_rejected", "job_lost"):
+            await publisher.publish_job_async("remux", {"id": job_id})
+        publisher.acks["job_ok"].set_result(Mock())
+        publisher.acks["job_rejected"].set_exception(RuntimeError("stream full"))
+
+        failed = await asyncio.wait_for(publisher.flush(), timeout=1)
+
+        assert failed == ["job_rejected", "job_lost"]
+        assert publisher.acks["job_lost"].cancelled()
+        assert await publisher.flush() == []
+
+    @pytest.mark.unit
+    async def test_failures_from_capped_collection_are_kept(self, publisher):
+        """Test that failures collected when the cap is hit are reported by flush()."""
+        publisher._pending_cap = 2
+        await publisher.publish_job_async("remux", {"id": "job_1"})
+        publisher.acks["job_1"].set_exception(RuntimeError("stream full"))
+        await publisher.publish_job_async("remux", {"id": "job_2"})
+        await publisher.publish_job_async("remux", {"id": "job_3"})
+        publisher.acks["job_3"].set_result(Mock())
+
+        assert await publisher.flush() == ["job_1", "job_2"]
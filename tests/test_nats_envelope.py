@@ -0,0 +1,175 @@
+import pytest
+import msgpack
+import orjson
+import zstandard
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+
+from app.api.services import nats_service
+from app.api.services.nats_service import NATSService, decode_job, MSGPACK_MAGIC
+
+
+class FakeMsg:
+    """Minimal stand-in for a NATS message."""
+
+    def __init__(self, data, headers=None):
+        self.data = data
+        self.headers = headers
+
+
+@pytest.fixture
+def service():
+    """A NATS service that publishes into a mock client."""
+    service = NATSService()
+    service.nc = Mock()
+    service.nc.publish = AsyncMock()
+    service._connected = True
+    return service
+
+
+def _published(service):
+    """Subject and decoded payload of the last core publish."""
+    subject, payload = service.nc.publish.call_args.args
+    assert payload[:1] == MSGPACK_MAGIC
+    return subject, msgpack.unpackb(payload[1:])
+
+
+class TestJobEnvelope:
+
+    @pytest.mark.unit
+    async def test_job_round_trip(self, service):
+        """Test that a packed job decodes back to the job that was published."""
+        job = {"id": "job_1", "asset_id": "asset_1", "input_path": "/media/a.mp4", "attempts": 0}
+
+        subject, payload, headers = await service._job_message("remux", job)
+        decoded = decode_job(FakeMsg(payload, headers))
+
+        assert subject == "jobs.remux"
+        assert payload[:1] == MSGPACK_MAGIC
+        assert headers == {"X-Job-Type": "remux", "X-Job-Id": "job_1"}
+        assert decoded["type"] == "remux"
+        assert decoded["id"] == "job_1"
+        assert decoded["data"] == job
+        datetime.fromisoformat(decoded["created_at"])
+
+    @pytest.mark.unit
+    async def test_prefix_matches_full_pack(self, service):
+        """Test that the cached prefix plus fields equals packing the whole dict."""
+        job = {"id": "job_1", "nested": {"list": [1, 2, 3]}}
+
+        _, payload, _ = await service._job_message("proxy", job)
+        decoded = decode_job(FakeMsg(payload))
+
+        assert payload == MSGPACK_MAGIC + msgpack.packb(decoded)
+        assert list(decoded) == ["type", "id", "data", "created_at"]
+
+    @pytest.mark.unit
+    async def test_job_without_id_has_no_id_header(self, service):
+        """Test that X-Job-Id is only set when the job has an id."""
+        _, payload, headers = await service._job_message("index", {"path": "/media"})
+
+        assert headers == {"X-Job-Type": "index"}
+        assert decode_job(FakeMsg(payload, headers))["id"] is None
+
+    @pytest.mark.unit
+    async def test_datetime_values_become_iso_strings(self, service):
+        """Test that datetimes in job data arrive as ISO strings, as with JSON."""
+        when = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+        _, payload, headers = await service._job_message("remux", {"id": "job_1", "when": when})
+
+        assert decode_job(FakeMsg(payload, headers))["data"]["when"] == when.isoformat()
+
+    @pytest.mark.unit
+    async def test_large_job_is_compressed(self, service):
+        """Test that payloads over ZSTD_MIN_SIZE are compressed and still decode."""
+        job = {"id": "job_1", "items": ["x" * 64 for _ in range(200)]}
+
+        _, payload, headers = await service._job_message("thumbnail", job)
+
+        assert headers["Content-Encoding"] == "zstd"
+        assert payload[:1] != MSGPACK_MAGIC
+        assert decode_job(FakeMsg(payload, headers))["data"] == job
+
+    @pytest.mark.unit
+    async def test_offloaded_job_is_compressed(self, service, monkeypatch):
+        """Test that jobs encoded in a worker thread decode like inline ones."""
+        monkeypatch.setattr(nats_service, "OFFLOAD_SIZE", 10)
+        job = {"id": "job_1", "input_path": "/media/a/long/path.mp4"}
+
+        _, payload, headers = await service._job_message("remux", job)
+        decoded = decode_job(FakeMsg(payload, headers))
+
+        assert headers["Content-Encoding"] == "zstd"
+        assert decoded["type"] == "remux"
+        assert decoded["id"] == "job_1"
+        assert decoded["data"] == job
+
+    @pytest.mark.unit
+    def test_decode_is_cached_on_message(self):
+        """Test that a message is decoded once however many times it is read."""
+        msg = FakeMsg(MSGPACK_MAGIC + msgpack.packb({"id": "job_1"}))
+
+        first = decode_job(msg)
+        msg.data = b"not a payload"
+
+        assert decode_job(msg) is first
+
+
+class TestLegacyMessages:
+
+    @pytest.mark.unit
+    def test_json_job_still_decodes(self):
+        """Test that JSON jobs published before the MessagePack switch decode."""
+        job = {"type": "remux", "id": "job_1", "data": {"id": "job_1"}, "created_at": "2024-01-02T03:04:05"}
+
+        assert decode_job(FakeMsg(orjson.dumps(job))) == job
+
+    @pytest.mark.unit
+    def test_compressed_json_job_still_decodes(self):
+        """Test that a zstd-compressed JSON job decodes."""
+        job = {"type": "remux", "id": "job_1", "data": {"id": "job_1"}}
+        payload = zstandard.ZstdCompressor().compress(orjson.dumps(job))
+
+        assert decode_job(FakeMsg(payload, {"Content-Encoding": "zstd"})) == job
+
+    @pytest.mark.unit
+    def test_magic_byte_never_starts_json(self):
+        """Test that the MessagePack marker cannot be mistaken for JSON."""
+        with pytest.raises(orjson.JSONDecodeError):
+            orjson.loads(MSGPACK_MAGIC)
+
+
+class TestEventEnvelope:
+
+    @pytest.mark.unit
+    async def test_event_round_trip(self, service):
+        """Test that an event payload packs the same fields as before."""
+        await service.publish_event("asset.created", {"asset_id": "asset_1"})
+
+        subject, decoded = _published(service)
+        assert subject == "events.asset.created"
+        assert list(decoded) == ["type", "data", "timestamp"]
+        assert decoded["type"] == "asset.created"
+        assert decoded["data"] == {"asset_id": "asset_1"}
+        datetime.fromisoformat(decoded["timestamp"])
+
+    @pytest.mark.unit
+    async def test_metric_round_trip(self, service):
+        """Test that a metric payload packs the same fields as before."""
+        await service.publish_metric("jobs.completed", 3, {"type": "remux"})
+
+        subject, decoded = _published(service)
+        assert subject == "metrics.jobs.completed"
+        assert list(decoded) == ["name", "value", "tags", "timestamp"]
+        assert decoded["name"] == "jobs.completed"
+        assert decoded["value"] == 3
+        assert decoded["tags"] == {"type": "remux"}
+
+    @pytest.mark.unit
+    async def test_metric_without_tags(self, service):
+        """Test that missing tags are sent as an empty map."""
+        await service.publish_metric("disk.free", 1.5)
+
+        _, decoded = _published(service)
+        assert decoded["tags"] == {}